@@ -6,6 +6,7 @@
 """
 
 import argparse
+import gzip
 import json
 import sys
 from datetime import datetime, timezone
@@ -131,8 +132,9 @@ class PtCocManager(ForensicToolBase):
             return self._explicit[kind]
         for template in DISCOVERY_PATTERNS.get(kind, []):
             candidate = self.output_dir / template.format(cid=self.case_id)
-            if candidate.exists():
-                return candidate
+            found = self._newest_existing((candidate, candidate.with_name(candidate.name + ".gz")))
+            if found is not None:
+                return found
         return None
 
     @staticmethod
@@ -149,7 +151,10 @@ class PtCocManager(ForensicToolBase):
         if not path.exists():
             return None
         try:
-            return json.loads(path.read_text(encoding="utf-8"))
+            raw = path.read_bytes()
+            if raw[:2] == b"\x1f\x8b":
+                raw = gzip.decompress(raw)
+            return self._parse_json(raw)
         except Exception as exc:
             ptprint(f"  ✗ Failed to parse {label}: {exc}", "ERROR", condition=self._out())
             return None
@@ -533,6 +538,7 @@ def get_help() -> List[Dict]:
             "Exit 0 = SUCCESS | Exit 1 = VALIDATION_FAILED | Exit 99 = error",
             "Gate mode loads imaging+verification+readability only (fast, early in workflow)",
             "Consolidate mode discovers ALL workflow reports + builds chronological timeline",
+            "Gzipped reports (<name>.json.gz) are discovered too; the newer file wins if both exist",
             "Recommended workflow: gate after image verification, consolidate before handover",
         ]},
     ]
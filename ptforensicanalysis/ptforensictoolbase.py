@@ -7,12 +7,14 @@
 
 import hashlib
 import json
+import os
 import re
+import shutil
 import signal
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from ptlibs.ptprinthelper import ptprint
 
@@ -23,6 +25,55 @@ except ImportError:
     from _constants import (IMAGE_FILE_KEYWORDS, EXIF_TIMEOUT, HASH_BLOCK_SIZE,
                              VALIDATE_TIMEOUT, MIN_IMAGE_BYTES, CORRUPT_SIZE_THRESHOLD)
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import magic
+    _LIBMAGIC = magic.Magic()
+except Exception:
+    _LIBMAGIC = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from wand.image import Image as _WandImage
+except ImportError:
+    _WandImage = None
+
+FILE_BATCH_SIZE = 512
+FICLONE = 0x40049409
+
+_COMMAND_CACHE: Dict[Tuple[str, str], bool] = {}
+
+
+def _batched(items: Sequence, n: int) -> Iterator[Sequence]:
+    for i in range(0, len(items), n):
+        yield items[i:i + n]
+
+
+def _clone_into(src_fd: int, dst_fd: int) -> Optional[str]:
+    if fcntl is not None:
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return "reflink"
+        except OSError:
+            pass
+    if not hasattr(os, "copy_file_range"):
+        return None
+    left = os.fstat(src_fd).st_size
+    while left > 0:
+        n = os.copy_file_range(src_fd, dst_fd, left)
+        if not n:
+            return None
+        left -= n
+    return "copy_file_range"
+
 
 def _forensic_sigint_handler(sig, frame):
     raise KeyboardInterrupt
@@ -75,6 +126,69 @@ class ForensicToolBase:
         except Exception:
             return None
 
+    @staticmethod
+    def _parse_json(raw: bytes) -> Any:
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    @staticmethod
+    def _dump_json(obj: Any, pretty: bool = False) -> bytes:
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            return orjson.dumps(obj, default=str, option=option)
+        if pretty:
+            return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        """Single write to a sibling temp file, then rename over path - readers never see a partial report."""
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _newest_existing(paths: Iterable[Path]) -> Optional[Path]:
+        """Most recently modified of paths that exist (earlier paths win ties), or None."""
+        best: Optional[Path] = None
+        best_mtime = -1
+        for path in paths:
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                continue
+            if mtime > best_mtime:
+                best, best_mtime = path, mtime
+        return best
+
+    @staticmethod
+    def _link_or_copy(src: Path, dst: Path) -> str:
+        """Hardlink, else reflink, else in-kernel copy, else copy2. Never use for files that are modified afterwards."""
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except FileExistsError:
+            raise
+        except OSError:
+            pass
+        try:
+            with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+                method = _clone_into(fsrc.fileno(), fdst.fileno())
+        except FileExistsError:
+            raise
+        except OSError:
+            method = None
+        if method:
+            shutil.copystat(src, dst)
+            return method
+        dst.unlink(missing_ok=True)
+        shutil.copy2(str(src), str(dst))
+        return "copy"
+
     def _progress(self, current: int, total: int, label: str = "") -> None:
         if not self._out() or total == 0:
             return
@@ -149,24 +263,89 @@ class ForensicToolBase:
         if info["size"] < MIN_IMAGE_BYTES:
             return "invalid", info
 
-        r = self._run_command(["file", "-b", str(filepath)], timeout=VALIDATE_TIMEOUT)
-        if r["success"] and not any(kw in r["stdout"].lower()
-                                     for kw in IMAGE_FILE_KEYWORDS):
+        desc = self._file_description(filepath)
+        if desc is not None and not any(kw in desc.lower()
+                                         for kw in IMAGE_FILE_KEYWORDS):
             return "invalid", info
 
-        if not self._check_command("identify"):
+        if not self._has_identify():
             return "corrupted" if info["size"] > CORRUPT_SIZE_THRESHOLD else "invalid", info
 
-        r = self._run_command(["identify", str(filepath)], timeout=VALIDATE_TIMEOUT)
-        if r["success"]:
-            m = re.search(r"(\w+)\s+(\d+)x(\d+)", r["stdout"])
-            if m:
-                info["imageFormat"] = m.group(1)
-                info["dimensions"] = f"{m.group(2)}x{m.group(3)}"
+        ident = self._identify(filepath)
+        if ident is not None:
+            info["imageFormat"], info["dimensions"] = ident
             return "valid", info
 
         return ("corrupted" if info["size"] > CORRUPT_SIZE_THRESHOLD else "invalid"), info
 
+    @staticmethod
+    def _decoder_backends() -> Dict[str, bool]:
+        """Which optional in-process bindings loaded; results computed without them can differ."""
+        return {"wand": _WandImage is not None, "libmagic": _LIBMAGIC is not None}
+
+    def _has_identify(self) -> bool:
+        return _WandImage is not None or self._check_command("identify")
+
+    def _identify(self, filepath: Path) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        if _WandImage is not None and not self.dry_run:
+            try:
+                with _WandImage.ping(filename=str(filepath)) as wi:
+                    return wi.format, f"{wi.width}x{wi.height}"
+            except Exception:
+                return None
+        r = self._run_command(["identify", "-ping", "-format", "%m %wx%h\\n", str(filepath)],
+                              timeout=VALIDATE_TIMEOUT)
+        if not r["success"]:
+            return None
+        m = re.search(r"(\w+)\s+(\d+)x(\d+)", r["stdout"])
+        return (m.group(1), f"{m.group(2)}x{m.group(3)}") if m else (None, None)
+
+    def _identify_many(self, filepaths: Iterable[Path]) -> Dict[str, Tuple[str, str]]:
+        """identify(1) format and geometry for many paths; paths it rejects are left out."""
+        if self.dry_run or _WandImage is not None:
+            return {}
+        # Names with a tab or newline cannot be split back out of the output;
+        # they are left to the per-file _identify call.
+        paths = [s for s in map(str, filepaths) if "\t" not in s and "\n" not in s]
+        found: Dict[str, Tuple[str, str]] = {}
+        for batch in _batched(paths, FILE_BATCH_SIZE):
+            wanted = set(batch)
+            r = self._run_command(["identify", "-ping", "-format", "%i\\t%m\\t%wx%h\\n", *batch],
+                                  timeout=VALIDATE_TIMEOUT * 4)
+            for line in r["stdout"].split("\n"):
+                name, _, rest = line.partition("\t")
+                fmt, _, dims = rest.partition("\t")
+                if dims and name in wanted and name not in found:
+                    found[name] = (fmt, dims)
+        return found
+
+    def _file_description(self, filepath: Path) -> Optional[str]:
+        if _LIBMAGIC is not None and not self.dry_run:
+            try:
+                return _LIBMAGIC.from_file(str(filepath))
+            except Exception:
+                pass
+        r = self._run_command(["file", "-b", str(filepath)], timeout=VALIDATE_TIMEOUT)
+        return r["stdout"] if r["success"] else None
+
+    def _file_descriptions(self, filepaths: Iterable[Path]) -> Dict[str, str]:
+        """file(1) descriptions for many paths, FILE_BATCH_SIZE paths per exec."""
+        if _LIBMAGIC is not None or self.dry_run:
+            return {}
+        descs: Dict[str, str] = {}
+        for batch in _batched([str(p) for p in filepaths], FILE_BATCH_SIZE):
+            r = self._run_command(["file", "-N", "-0", "--", *batch],
+                                  timeout=VALIDATE_TIMEOUT * 4)
+            if not r["success"]:
+                continue
+            parts = r["stdout"].split("\0")
+            name = parts[0]
+            for part in parts[1:]:
+                desc, _, next_name = part.partition("\n")
+                descs[name] = desc[2:] if desc.startswith(": ") else desc
+                name = next_name
+        return descs
+
     def _extract_fs_metadata(self, filepath: Path) -> Dict:
         meta: Dict = {}
         try:
@@ -201,11 +380,11 @@ class ForensicToolBase:
         return exif_data, has_exif
 
     def _check_command(self, cmd: str) -> bool:
-        try:
-            subprocess.run(["which", cmd], capture_output=True, check=True, timeout=5)
-            return True
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
-            return False
+        key = (os.environ.get("PATH", ""), cmd)
+        found = _COMMAND_CACHE.get(key)
+        if found is None:
+            found = _COMMAND_CACHE[key] = shutil.which(cmd, path=key[0]) is not None
+        return found
 
     def _run_command(self, cmd: List[str], timeout: int = 300,
                      binary: bool = False) -> Dict[str, Any]:
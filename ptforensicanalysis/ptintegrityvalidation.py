@@ -6,11 +6,20 @@
 """
 
 import argparse
-import json
+import gzip
+import hashlib
+from array import array
+import os
+import re
 import sys
+import threading
+import zlib
+from collections import Counter
+from itertools import compress
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
 
 try:
     from ._version import __version__
@@ -18,9 +27,16 @@ except ImportError:
     from _version import __version__
 
 try:
-    from ._constants import IMAGE_EXTENSIONS, DEFAULT_OUTPUT_DIR, VALIDATE_TIMEOUT
+    from ._constants import (IMAGE_EXTENSIONS, IMAGE_FILE_KEYWORDS, DEFAULT_OUTPUT_DIR,
+                              VALIDATE_TIMEOUT, MIN_IMAGE_BYTES)
 except ImportError:
-    from _constants import IMAGE_EXTENSIONS, DEFAULT_OUTPUT_DIR, VALIDATE_TIMEOUT
+    from _constants import (IMAGE_EXTENSIONS, IMAGE_FILE_KEYWORDS, DEFAULT_OUTPUT_DIR,
+                             VALIDATE_TIMEOUT, MIN_IMAGE_BYTES)
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 try:
     from .ptforensictoolbase import ForensicToolBase
@@ -41,69 +57,286 @@ CORRUPTION_TYPES: Dict[str, str] = {
     "unknown": "Unclassified corruption",
 }
 
+MAGIC_SIGNATURES: Tuple[Tuple[bytes, str], ...] = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+    (b"II+\x00", "tiff"),
+    (b"MM\x00+", "tiff"),
+    (b"BM", "bmp"),
+)
+
+SNIFFED_EXTENSIONS: Dict[str, str] = {
+    ".jpg": "jpeg", ".jpeg": "jpeg",
+    ".png": "png",
+    ".gif": "gif",
+    ".bmp": "bmp",
+    ".tif": "tiff", ".tiff": "tiff",
+}
 
-class PtIntegrityValidation(ForensicToolBase):
-    """Forensic integrity validation - file + identify + format tools, NIST SP 800-86, ISO/IEC 27037:2012."""
+MAGIC_PREFIXES: Dict[str, Tuple[bytes, ...]] = {
+    fmt: tuple(sig for sig, f in MAGIC_SIGNATURES if f == fmt) for _, fmt in MAGIC_SIGNATURES
+}
+ALL_MAGIC_PREFIXES: Tuple[bytes, ...] = tuple(sig for sig, _ in MAGIC_SIGNATURES)
+MAGIC_HEAD_BYTES = max(map(len, ALL_MAGIC_PREFIXES))
 
-    def __init__(self, args: argparse.Namespace) -> None:
-        self.ptjsonlib = ptjsonlib.PtJsonLib()
-        self.args = args
-        self.case_id = self._sanitize_case_id(args.case_id)
-        self.analyst = args.analyst
-        self.dry_run = args.dry_run
-        self.output_dir = Path(args.output_dir)
-        try:
-            self.output_dir.mkdir(parents=True, exist_ok=True)
-        except PermissionError:
-            raise PermissionError(f"Permission denied: {self.output_dir} - try running with sudo")
+FORMAT_MIN_BYTES: Dict[str, int] = {
+    ".jpg": 125, ".jpeg": 125,
+    ".png": 67,
+    ".gif": 24,
+}
+STATUS_CODES: Tuple[str, ...] = ("valid", "repairable", "corrupted")
+CTYPE_CODES: Tuple[str, ...] = ("none",) + tuple(CORRUPTION_TYPES)
+STATUS_INDEX: Dict[str, int] = {s: i for i, s in enumerate(STATUS_CODES)}
+CTYPE_INDEX: Dict[str, int] = {c: i for i, c in enumerate(CTYPE_CODES)}
 
-        self.consolidated_dir = Path(args.consolidated_dir)
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
 
-        self.total = 0
-        self.valid = 0
-        self.repairable = 0
-        self.corrupted = 0
-        self.by_format: Dict[str, int] = {}
-        self.corruption_types: Dict[str, int] = {}
-        self._results: List[Dict] = []
+MAX_IMAGE_PIXELS = 80_000_000
+# PIL error text -> corruption type in one pass; "truncat" wins wherever it appears.
+PIL_ERROR_TYPES = re.compile(r"^(?:(?=.*?(?P<truncated>truncat))|(?=.*?(?P<invalid_header>header|magic)))",
+                             re.IGNORECASE | re.DOTALL)
 
-        self._init_properties(__version__)
+VERDICT_CACHE_VERSION = 2
+FINGERPRINT_BYTES = 64 * 1024
 
-    def _validate_jpeg_pil(self, path: Path) -> Tuple[str, str]:
+PROCESS_POOL_MIN_FILES = 1000
+MAX_DEFAULT_WORKERS = 16
+FDS_PER_WORKER = 8
+PREFETCH_BYTES = 64 * 1024
+PREFETCH_AHEAD = 100
+
+
+def _prefetch_headers(paths: List[Path], slots: threading.Semaphore) -> None:
+    for path in paths:
+        slots.acquire()
         try:
-            from PIL import Image
-            Image.MAX_IMAGE_PIXELS = None
-            img = Image.open(str(path))
-            img.verify()
-            return "valid", "none"
-        except ImportError:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, PREFETCH_BYTES, os.POSIX_FADV_WILLNEED)
+        except OSError:
             pass
+        finally:
+            os.close(fd)
+
+
+def _load_pil() -> Optional[Tuple[object, type]]:
+    """Import PIL once per validator and apply the decode limits the verdicts rely on."""
+    try:
+        from PIL import Image, ImageFile, UnidentifiedImageError
+    except ImportError:
+        return None
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    ImageFile.LOAD_TRUNCATED_IMAGES = False
+    return Image, UnidentifiedImageError
+
+
+def _pil_version() -> Optional[str]:
+    try:
+        import PIL
+    except ImportError:
+        return None
+    return getattr(PIL, "__version__", "")
+
+
+def _iter_images(root: Path, exts: FrozenSet[str]) -> Iterator[Tuple[Path, Optional[os.stat_result]]]:
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    name = entry.name
+                    dot = name.rfind(".")
+                    if dot >= 0 and name[dot:].lower() in exts:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            st = None
+                        yield Path(entry.path), st
+
+
+class _ResultTable:
+    """Column-oriented store for per-file results; rows are materialised only for the report."""
+
+    def __init__(self) -> None:
+        self.paths: List[str] = []
+        self.status = array("b")
+        self.ctype = array("b")
+        self.size = array("q")
+        self.image_format: List[Optional[str]] = []
+        self.dimensions: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def append(self, result: Dict) -> None:
+        fmt, dims = result["imageFormat"], result["dimensions"]
+        self.paths.append(result["path"])
+        self.status.append(STATUS_INDEX[result["status"]])
+        self.ctype.append(CTYPE_INDEX[result["corruptionType"]])
+        self.size.append(result["sizeBytes"])
+        self.image_format.append(sys.intern(fmt) if fmt else fmt)
+        self.dimensions.append(sys.intern(dims) if dims else dims)
+
+    def rows(self) -> Iterator[Dict]:
+        for path, st, ct, size, fmt, dims in zip(self.paths, self.status, self.ctype,
+                                                  self.size, self.image_format, self.dimensions):
+            yield {
+                "path": path,
+                "filename": os.path.basename(path),
+                "status": STATUS_CODES[st],
+                "corruptionType": CTYPE_CODES[ct],
+                "sizeBytes": size,
+                "imageFormat": fmt,
+                "dimensions": dims,
+            }
+
+
+class _FileValidator(ForensicToolBase):
+    """Per-file validation pipeline; picklable state only, so it can run in worker processes."""
+
+    def __init__(self, dry_run: bool, verdict_cache: Dict[str, Dict],
+                 tools: FrozenSet[str] = frozenset(),
+                 descriptions: Optional[Dict[str, str]] = None,
+                 identified: Optional[Dict[str, Tuple[str, str]]] = None) -> None:
+        self.dry_run = dry_run
+        self._verdict_cache = verdict_cache
+        self._detail = self._build_detail(tools)
+        self._descriptions = descriptions or {}
+        self._identified = identified or {}
+        self._pil = _load_pil()
+
+    def _file_description(self, filepath: Path) -> Optional[str]:
+        desc = self._descriptions.get(str(filepath))
+        return desc if desc is not None else super()._file_description(filepath)
+
+    def _identify(self, filepath: Path) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        ident = self._identified.get(str(filepath))
+        return ident if ident is not None else super()._identify(filepath)
+
+    def _build_detail(self, tools: FrozenSet[str]) -> Dict[str, Callable[[Path], Tuple[str, str]]]:
+        jpeg = self._validate_jpeg_detail if "jpeginfo" in tools else self._validate_jpeg_footer
+        png = self._validate_png_detail if "pngcheck" in tools else self._validate_png_chunks
+        tiff = self._validate_tiff_detail if "tiffinfo" in tools else self._validate_generic_detail
+        return {".jpg": jpeg, ".jpeg": jpeg, ".png": png, ".tif": tiff, ".tiff": tiff}
+
+    def _decode_pil(self, path: Path) -> Optional[Tuple[str, str]]:
+        if self._pil is None:
+            return None
+        Image, UnidentifiedImageError = self._pil
+        try:
+            with Image.open(str(path)) as img:
+                if img.width * img.height > MAX_IMAGE_PIXELS:
+                    return "corrupted", "invalid_header"
+                if img.format == "JPEG":
+                    img.draft("RGB", (32, 32))
+                img.load()
+        except Image.DecompressionBombError:
+            return "corrupted", "invalid_header"
+        except UnidentifiedImageError:
+            return "corrupted", "invalid_header"
+        except SyntaxError:
+            return "repairable", "invalid_header"
         except Exception as exc:
-            exc_s = str(exc).lower()
-            if "truncat" in exc_s:
-                return "repairable", "truncated"
-            if "header" in exc_s or "magic" in exc_s:
-                return "repairable", "invalid_header"
-            return "repairable", "corrupt_data"
+            m = PIL_ERROR_TYPES.match(str(exc))
+            return "repairable", m.lastgroup if m else "corrupt_data"
+        return "valid", "none"
 
+    def _validate_jpeg_pil(self, path: Path) -> Tuple[str, str]:
+        return self._decode_pil(path) or ("corrupted", "unknown")
+
+    @staticmethod
+    def _missing_eoi(path: Path) -> bool:
         try:
-            from PIL import Image, ImageFile
-            ImageFile.LOAD_TRUNCATED_IMAGES = True
-            img = Image.open(str(path))
-            img.load()
-            return "repairable", "truncated"
-        except Exception:
-            pass
+            with open(path, "rb") as fh:
+                fh.seek(-2, os.SEEK_END)
+                return fh.read(2) != b"\xff\xd9"
+        except OSError:
+            return False
 
-        return "corrupted", "unknown"
+    @staticmethod
+    def _walk_jpeg_markers(data: bytes) -> Optional[Tuple[str, str]]:
+        if data[:2] != b"\xff\xd8":
+            return "corrupted", "invalid_header"
+        pos, seen_sof, end = 2, False, len(data)
+        while pos + 4 <= end:
+            if data[pos] != 0xFF:
+                return "repairable", "corrupt_segments"
+            marker = data[pos + 1]
+            if marker == 0xFF:
+                pos += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+                pos += 2
+                continue
+            if marker == 0xD9:
+                return "repairable", "corrupt_segments"
+            seglen = int.from_bytes(data[pos + 2:pos + 4], "big")
+            if seglen < 2:
+                return "repairable", "corrupt_segments"
+            if marker == 0xDA:
+                return None if seen_sof else ("repairable", "corrupt_segments")
+            seen_sof = seen_sof or marker in JPEG_SOF_MARKERS
+            pos += 2 + seglen
+        return "repairable", "truncated"
+
+    def _validate_jpeg_footer(self, path: Path) -> Tuple[str, str]:
+        if self._missing_eoi(path):
+            return "repairable", "missing_footer"
+        try:
+            with open(path, "rb") as fh:
+                head = fh.read(FINGERPRINT_BYTES)
+        except OSError:
+            return "corrupted", "unknown"
+        verdict = self._walk_jpeg_markers(head)
+        if verdict == ("repairable", "truncated") and len(head) == FINGERPRINT_BYTES:
+            verdict = None
+        return verdict or self._validate_jpeg_pil(path)
 
-    def _validate_jpeg_detail(self, path: Path) -> Tuple[str, str]:
+    @staticmethod
+    def _validate_png_chunks(path: Path) -> Tuple[str, str]:
         try:
-            tail = path.read_bytes()[-2:]
-            if tail != bytes([0xFF, 0xD9]):
-                return "repairable", "missing_footer"
-        except Exception:
-            pass
+            data = memoryview(path.read_bytes())
+        except OSError:
+            return "corrupted", "unknown"
+        if data[:8] != PNG_SIGNATURE:
+            return "corrupted", "invalid_header"
+        pos, end, first = 8, len(data), True
+        while pos < end:
+            if pos + 12 > end:
+                return "repairable", "truncated"
+            length = int.from_bytes(data[pos:pos + 4], "big")
+            ctype = data[pos + 4:pos + 8]
+            if length > 0x7FFFFFFF or not bytes(ctype).isalpha():
+                return "repairable", "corrupt_segments"
+            if first and ctype != b"IHDR":
+                return "corrupted", "invalid_header"
+            stop = pos + 8 + length
+            if stop + 4 > end:
+                return "repairable", "truncated"
+            crc = zlib.crc32(data[stop - length:stop], zlib.crc32(ctype))
+            if crc != int.from_bytes(data[stop:stop + 4], "big"):
+                return ("corrupted", "invalid_header") if first else ("repairable", "corrupt_segments")
+            if ctype == b"IEND":
+                return "valid", "none"
+            pos, first = stop + 4, False
+        return "repairable", "missing_footer"
+
+    def _validate_jpeg_detail(self, path: Path) -> Tuple[str, str]:
+        if self._missing_eoi(path):
+            return "repairable", "missing_footer"
 
         r = self._run_command(["jpeginfo", "-c", str(path)], timeout=VALIDATE_TIMEOUT)
         if r["success"]:
@@ -145,43 +378,96 @@ class PtIntegrityValidation(ForensicToolBase):
         return "corrupted", "unknown"
 
     def _validate_generic_detail(self, path: Path) -> Tuple[str, str]:
-        try:
-            from PIL import Image
-            img = Image.open(str(path))
-            img.verify()
-            return "valid", "none"
-        except ImportError:
-            pass
-        except Exception:
-            return "repairable", "corrupt_data"
-        return "corrupted", "unknown"
+        return self._decode_pil(path) or ("corrupted", "unknown")
 
     def _detect_detail(self, path: Path, base_status: str,
                        ext: str) -> Tuple[str, str]:
         if base_status != "valid":
             return "repairable", "corrupt_data"
-        if ext in (".jpg", ".jpeg"):
-            return self._validate_jpeg_detail(path)
-        if ext == ".png":
-            return self._validate_png_detail(path)
-        if ext in (".tif", ".tiff"):
-            return self._validate_tiff_detail(path)
-        return self._validate_generic_detail(path)
-
-    def _validate_full(self, path: Path) -> Dict:
+        return self._detail.get(ext, self._validate_generic_detail)(path)
+
+    @staticmethod
+    def _read_head(path: Path, size: int) -> Optional[bytes]:
+        if size == 0:
+            return b""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                return os.pread(fd, MAGIC_HEAD_BYTES, 0)
+            finally:
+                os.close(fd)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _drop_cache(path: Path) -> None:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _file_result(path: Path, status: str, ctype: str, size: int,
+                     image_format: Optional[str] = None,
+                     dimensions: Optional[str] = None) -> Dict:
+        return {
+            "path": str(path),
+            "filename": path.name,
+            "status": status,
+            "corruptionType": ctype,
+            "sizeBytes": size,
+            "imageFormat": image_format,
+            "dimensions": dimensions,
+        }
+
+    def _precheck(self, path: Path, ext: str, size: Optional[int],
+                  head: Optional[bytes] = None) -> Tuple[Optional[Dict], bool]:
+        """Early verdict from the magic bytes, and whether they match the extension."""
+        if size is None:
+            try:
+                size = path.stat().st_size
+            except OSError:
+                return None, False
+        expected = SNIFFED_EXTENSIONS.get(ext)
+        if expected is None:
+            return None, False
+        if head is None:
+            head = self._read_head(path, size)
+        if head is None:
+            return None, False
+        if not head.startswith(MAGIC_PREFIXES[expected]):
+            if head.startswith(ALL_MAGIC_PREFIXES):
+                return None, False
+            # Unknown to the sniff table: only file(1) saying "not an image" settles it early.
+            desc = self._file_description(path)
+            if desc is None or any(kw in desc.lower() for kw in IMAGE_FILE_KEYWORDS):
+                return None, False
+            return self._file_result(path, "corrupted", "invalid_header", size), False
+        if size < FORMAT_MIN_BYTES.get(ext, 0):
+            return self._file_result(path, "corrupted", "truncated", size), True
+        return None, True
+
+    def _validate_full(self, path: Path, size: Optional[int] = None,
+                       head: Optional[bytes] = None) -> Dict:
         ext = path.suffix.lower()
-        base_status, vinfo = self._validate_image_file(path)
+        early, magic_ok = self._precheck(path, ext, size, head)
+        if early:
+            return early
+
+        ident = self._identified.get(str(path)) if magic_ok and size is not None else None
+        if ident is not None:
+            base_status, vinfo = "valid", {"size": size, "imageFormat": ident[0], "dimensions": ident[1]}
+        else:
+            base_status, vinfo = self._validate_image_file(path)
 
         if base_status == "invalid":
-            return {
-                "path": str(path),
-                "filename": path.name,
-                "status": "corrupted",
-                "corruptionType": "invalid_header",
-                "sizeBytes": vinfo.get("size", 0),
-                "imageFormat": None,
-                "dimensions": None,
-            }
+            return self._file_result(path, "corrupted", "invalid_header", vinfo.get("size", 0))
 
         det_status, ctype = self._detect_detail(path, base_status, ext)
 
@@ -194,28 +480,151 @@ class PtIntegrityValidation(ForensicToolBase):
             if ctype == "none":
                 ctype = "unknown"
 
+        return self._file_result(path, final_status, ctype, vinfo.get("size", 0),
+                                 vinfo.get("imageFormat"), vinfo.get("dimensions"))
+
+    @staticmethod
+    def _fingerprint(path: Path) -> Tuple[Optional[Dict], Optional[bytes]]:
+        """Cache fingerprint plus the head bytes it hashed, so the magic check needs no second open."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                st = os.fstat(fd)
+                head = os.pread(fd, FINGERPRINT_BYTES, 0)
+            finally:
+                os.close(fd)
+        except OSError:
+            return None, None
+        return {"sizeBytes": st.st_size, "mtimeNs": st.st_mtime_ns,
+                "headSha1": hashlib.sha1(head).hexdigest()}, head
+
+    def validate(self, path: Path, size: Optional[int] = None) -> Tuple[Dict, Optional[Dict]]:
+        fp, head = (None, None) if self.dry_run else self._fingerprint(path)
+        cached = self._verdict_cache.get(str(path))
+        if fp and cached and cached["fingerprint"] == fp:
+            return {"path": str(path), "filename": path.name, **cached["result"]}, cached
+
+        if fp and size is None:
+            size = fp["sizeBytes"]
+        result = self._validate_full(path, size, head)
+        if hasattr(os, "posix_fadvise"):
+            self._drop_cache(path)
+        if not fp:
+            return result, None
+        verdict = {k: v for k, v in result.items() if k not in ("path", "filename")}
+        return result, {"fingerprint": fp, "result": verdict}
+
+
+_WORKER: Optional[_FileValidator] = None
+
+
+def _worker_init(dry_run: bool, verdict_cache: Dict[str, Dict],
+                 tools: FrozenSet[str], descriptions: Dict[str, str],
+                 identified: Dict[str, Tuple[str, str]]) -> None:
+    global _WORKER
+    _WORKER = _FileValidator(dry_run, verdict_cache, tools, descriptions, identified)
+
+
+def _validate_worker(path: Path, size: Optional[int]) -> Tuple[Dict, Optional[Dict]]:
+    return _WORKER.validate(path, size)
+
+
+class PtIntegrityValidation(ForensicToolBase):
+    """Forensic integrity validation - file + identify + format tools, NIST SP 800-86, ISO/IEC 27037:2012."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.ptjsonlib = ptjsonlib.PtJsonLib()
+        self.args = args
+        self.case_id = self._sanitize_case_id(args.case_id)
+        self.analyst = args.analyst
+        self.dry_run = args.dry_run
+        self.output_dir = Path(args.output_dir)
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        except PermissionError:
+            raise PermissionError(f"Permission denied: {self.output_dir} - try running with sudo")
+
+        self.consolidated_dir = Path(args.consolidated_dir)
+        self.workers = args.workers
+        self.verdict_cache_file = self.output_dir / f"{self.case_id}_validation_cache.json"
+
+        self.total = 0
+        self.valid = 0
+        self.repairable = 0
+        self.corrupted = 0
+        self.by_format: Counter[str] = Counter()
+        self.corruption_types: Counter[str] = Counter()
+        self._results = _ResultTable()
+        self._verdict_cache: Dict[str, Dict] = {}
+        self._tools: FrozenSet[str] = frozenset()
+
+        self._init_properties(__version__)
+
+    def _verdict_cache_header(self) -> Dict:
+        """Everything besides the file itself that can change a verdict."""
         return {
-            "path": str(path),
-            "filename": path.name,
-            "status": final_status,
-            "corruptionType": ctype,
-            "sizeBytes": vinfo.get("size", 0),
-            "imageFormat": vinfo.get("imageFormat"),
-            "dimensions": vinfo.get("dimensions"),
+            "version": VERDICT_CACHE_VERSION,
+            "tools": sorted(self._tools),
+            "decoders": {"pil": _pil_version(), **self._decoder_backends()},
         }
 
+    def _load_verdict_cache(self) -> Dict[str, Dict]:
+        try:
+            data = self._parse_json(self.verdict_cache_file.read_bytes())
+        except Exception:
+            return {}
+        if any(data.get(k) != v for k, v in self._verdict_cache_header().items()):
+            return {}
+        return data.get("entries", {})
+
+    def _save_verdict_cache(self, entries: Dict[str, Dict]) -> None:
+        if self.dry_run:
+            return
+        data = {**self._verdict_cache_header(), "entries": entries}
+        try:
+            self._write_atomic(self.verdict_cache_file, self._dump_json(data))
+        except OSError as exc:
+            ptprint(f"  Validation cache not saved: {exc}", "WARNING", condition=self._out())
+
+    def _maybe_cached(self, path: Path, st: Optional[os.stat_result]) -> bool:
+        entry = self._verdict_cache.get(str(path))
+        if not entry or st is None:
+            return False
+        fp = entry["fingerprint"]
+        return fp["sizeBytes"] == st.st_size and fp["mtimeNs"] == st.st_mtime_ns
+
+    def _ensure_fd_headroom(self, workers: int) -> None:
+        if resource is None:
+            return
+        needed = 64 + workers * FDS_PER_WORKER
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft == resource.RLIM_INFINITY or soft >= needed:
+            return
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        except (ValueError, OSError):
+            pass
+        if soft < needed:
+            ptprint(f"  Open-file limit {soft} is low for {workers} workers (want {needed}); "
+                    f"lower --workers or raise ulimit -n", "WARNING", condition=self._out())
+
     def check_tools(self) -> bool:
         ptprint("\n[1/2] Checking validation tools", "TITLE", condition=self._out())
         tools = {
-            "identify": "ImageMagick (required)",
+            "identify": "ImageMagick (required; Wand binding also accepted)",
             "file": "file type detection (required)",
             "jpeginfo": "JPEG validation (optional)",
             "pngcheck": "PNG validation (optional)",
             "tiffinfo": "TIFF validation (optional)",
         }
         missing_required = []
+        available = set()
         for t, desc in tools.items():
-            found = self._check_command(t)
+            found = self._has_identify() if t == "identify" else self._check_command(t)
+            if found:
+                available.add(t)
             ptprint(f"  [{'OK' if found else 'WARN'}] {t}: {desc}",
                     "OK" if found else "WARNING", condition=self._out())
             if not found and "required" in desc:
@@ -229,31 +638,37 @@ class PtIntegrityValidation(ForensicToolBase):
 
         ptprint("  Optional tools fall back to PIL/Pillow if unavailable.",
                 "INFO", condition=self._out())
-        self._add_node("toolsCheck", True, tools=list(tools))
+        pil = _pil_version()
+        simd = pil is not None and ".post" in pil
+        if pil is None:
+            ptprint("  [WARN] PIL/Pillow: not installed (decode fallback disabled)",
+                    "WARNING", condition=self._out())
+        elif simd:
+            ptprint(f"  [OK] Pillow-SIMD {pil}", "OK", condition=self._out())
+        else:
+            ptprint(f"  [INFO] Pillow {pil}: pip install pillow-simd for faster JPEG decode",
+                    "INFO", condition=self._out())
+        self._tools = frozenset(available)
+        self._add_node("toolsCheck", True, tools=list(tools), pillow=pil, pillowSimd=simd)
         return True
 
-    def _update_counts(self, result: Dict) -> None:
-        status = result["status"]
-        fmt = Path(result["path"]).suffix.lower().lstrip(".")
-        self.total += 1
-        if status == "valid":
-            self.valid += 1
-        elif status == "repairable":
-            self.repairable += 1
-        else:
-            self.corrupted += 1
-        self.by_format[fmt] = self.by_format.get(fmt, 0) + 1
-        if status in ("repairable", "corrupted"):
-            ctype = result["corruptionType"]
-            self.corruption_types[ctype] = self.corruption_types.get(ctype, 0) + 1
+    def _aggregate(self) -> None:
+        table = self._results
+        status = Counter(table.status)
+        self.total = len(table)
+        self.valid, self.repairable, self.corrupted = (status[i] for i in range(len(STATUS_CODES)))
+        self.by_format = Counter(os.path.splitext(p)[1][1:].lower() for p in table.paths)
+        damaged = Counter(compress(table.ctype, table.status))
+        self.corruption_types = Counter({CTYPE_CODES[c]: n for c, n in damaged.items()})
 
     def _print_validation_summary(self) -> None:
         ptprint(f"\n  Validated: {self.total}  |  Valid: {self.valid}  |  Repairable: {self.repairable}  |  Corrupted: {self.corrupted}",
                 "OK", condition=self._out())
         if self.corruption_types:
-            ptprint("  Corruption types:", "INFO", condition=self._out())
-            for ctype, count in sorted(self.corruption_types.items()):
-                ptprint(f"    {count}x {CORRUPTION_TYPES.get(ctype, ctype)}", "INFO", condition=self._out())
+            lines = ["  Corruption types:"]
+            lines += [f"    {count}x {CORRUPTION_TYPES.get(ctype, ctype)}"
+                      for ctype, count in sorted(self.corruption_types.items())]
+            ptprint("\n".join(lines), "INFO", condition=self._out())
 
     def validate_all(self) -> bool:
         ptprint("\n[2/2] Validating files (in-place - no copies created)",
@@ -263,10 +678,9 @@ class PtIntegrityValidation(ForensicToolBase):
             return self._fail("integrityValidation",
                               f"Directory not found: {self.consolidated_dir}")
 
-        candidates = [] if self.dry_run else [
-            f for f in self.consolidated_dir.rglob("*")
-            if f.is_file() and f.suffix.lower() in IMAGE_EXTENSIONS
-        ]
+        found = [] if self.dry_run else list(_iter_images(self.consolidated_dir, IMAGE_EXTENSIONS))
+        candidates = [path for path, _ in found]
+        sizes = [st.st_size if st else None for _, st in found]
 
         ptprint(f"  Files to validate: {len(candidates)}", "INFO", condition=self._out())
 
@@ -276,15 +690,53 @@ class PtIntegrityValidation(ForensicToolBase):
             self._add_node("integrityValidation", True, dryRun=self.dry_run, totalFiles=0)
             return True
 
-        for idx, fp in enumerate(candidates, 1):
-            self._progress(idx, len(candidates), fp.name[:35])
-            result = self._validate_full(fp)
-            self._results.append(result)
-            self._update_counts(result)
+        if not self.dry_run:
+            self._verdict_cache = self._load_verdict_cache()
+        # Sizes the prechecks already reject never reach file(1)/identify.
+        uncached = [p for p, st in found if not self._maybe_cached(p, st)
+                    and (st is None or st.st_size >= max(MIN_IMAGE_BYTES, FORMAT_MIN_BYTES.get(p.suffix.lower(), 0)))]
+        descriptions = self._file_descriptions(uncached)
+        identified = self._identify_many(uncached) if "identify" in self._tools else {}
+        cpus = os.cpu_count() or 1
+        use_processes = self.args.processes or len(candidates) >= PROCESS_POOL_MIN_FILES
+        workers = max(1, self.workers or min(cpus if use_processes else 2 * cpus, MAX_DEFAULT_WORKERS))
+        self._ensure_fd_headroom(workers)
+        if use_processes:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                                       initargs=(self.dry_run, self._verdict_cache, self._tools,
+                                                 descriptions, identified))
+            outcomes = pool.map(_validate_worker, candidates, sizes, chunksize=32)
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+            validator = _FileValidator(self.dry_run, self._verdict_cache, self._tools,
+                                       descriptions, identified)
+            outcomes = pool.map(validator.validate, candidates, sizes)
+
+        # Started only now: map() has submitted every task, so a process pool has
+        # already forked its workers and none of them inherits a running thread.
+        slots = threading.Semaphore(PREFETCH_AHEAD)
+        if hasattr(os, "posix_fadvise"):
+            threading.Thread(target=_prefetch_headers, args=(candidates, slots),
+                             daemon=True).start()
+
+        verdicts: Dict[str, Dict] = {}
+        n = len(candidates)
+        step = max(1, n // 100)
+        show = self._out()
+        with pool:
+            for idx, (result, verdict) in enumerate(outcomes, 1):
+                slots.release()
+                if show and (idx % step == 0 or idx == n):
+                    self._progress(idx, n, result["filename"][:35])
+                self._results.append(result)
+                if verdict:
+                    verdicts[result["path"]] = verdict
 
         if self._out():
             print()
 
+        self._aggregate()
+        self._save_verdict_cache(verdicts)
         self._print_validation_summary()
 
         self._add_node("integrityValidation", True,
@@ -294,7 +746,7 @@ class PtIntegrityValidation(ForensicToolBase):
                        corruptedFiles=self.corrupted,
                        corruptionTypes=self.corruption_types,
                        byFormat=self.by_format,
-                       fileResults=self._results)
+                       fileResults=list(self._results.rows()))
         return True
 
 
@@ -343,45 +795,71 @@ class PtIntegrityValidation(ForensicToolBase):
     def save_report(self) -> Optional[str]:
         if not self.args.json_out:
             return None
-        raw = self.ptjsonlib.get_result_json()
-        Path(self.args.json_out).write_text(raw, encoding="utf-8")
-        ptprint(f"\n✓ JSON report saved: {self.args.json_out}", "OK", condition=True)
-        return self.args.json_out
+        json_out = self.args.json_out
+        data = self._dump_json(self.ptjsonlib.json_object)
+        if self.args.gzip:
+            if not json_out.endswith(".gz"):
+                json_out += ".gz"
+            data = gzip.compress(data)
+        self._write_atomic(Path(json_out), data)
+        ptprint(f"\n✓ JSON report saved: {json_out}", "OK", condition=True)
+
+        if self.args.pretty:
+            pretty_out = Path(self.args.json_out.removesuffix(".gz")).with_suffix(".pretty.json")
+            self._write_atomic(pretty_out, self._dump_json(self.ptjsonlib.json_object, pretty=True))
+            ptprint(f"✓ Readable copy saved: {pretty_out}", "OK", condition=True)
+        return json_out
+
+
+_HELP: List[Dict] = [
+    {"description": [
+        "Forensic file integrity validation - ptlibs compliant",
+        "Two-stage validation: file(1) + ImageMagick + format-specific tools",
+        "Validates files IN-PLACE (no copies created) - no extra disk space needed",
+        "Compliant with NIST SP 800-86 and ISO/IEC 27037:2012",
+    ]},
+    {"usage": ["ptintegrityvalidation <case-id> <consolidated-dir> [options]"]},
+    {"usage_example": [
+        "ptintegrityvalidation CASE-001 /var/forensics/images/CASE-001_consolidated",
+        "ptintegrityvalidation CASE-001 /path/to/consolidated --dry-run",
+        "ptintegrityvalidation CASE-001 /path/to/consolidated --json-out step10.json",
+    ]},
+    {"options": [
+        ["case-id", "", "Forensic case identifier - REQUIRED"],
+        ["consolidated-dir", "", "Path to consolidated directory - REQUIRED"],
+        ["-o", "--output-dir", "<dir>", f"Report output directory (default: {DEFAULT_OUTPUT_DIR})"],
+        ["-a", "--analyst", "<n>", "Analyst name (default: Analyst)"],
+        ["-j", "--json-out", "<f>", "Save JSON report to file (compact)"],
+        ["--pretty", "", "Also write an indented <json-out>.pretty.json copy"],
+        ["--gzip", "", "Gzip the JSON report (.gz appended if missing)"],
+        ["-w", "--workers", "<n>", f"Parallel validation workers (default: 2x CPU threads / 1x CPU processes, max {MAX_DEFAULT_WORKERS})"],
+        ["-P", "--processes", "", f"Validate in worker processes (automatic from {PROCESS_POOL_MIN_FILES} files)"],
+        ["-q", "--quiet", "", "Suppress terminal output"],
+        ["--dry-run", "", "Simulate without reading files"],
+        ["-h", "--help", "", "Show help"],
+        ["--version", "", "Show version"],
+    ]},
+    {"notes": [
+        "Required: file(1) + ImageMagick identify",
+        "Optional: jpeginfo | pngcheck | tiffinfo | PIL fallback (Pillow-SIMD detected and reported)",
+        f"PIL decode refused above {MAX_IMAGE_PIXELS:,} pixels (declared size) -> invalid_header",
+        "Without pngcheck, PNG chunk CRCs are checked in-process; JPEG markers are walked before PIL",
+        "Optional: pip install python-magic (in-process libmagic instead of file(1))",
+        "Output: case_id_integrity_validation.json with per-file classification",
+        "JSON report is written compact; ptrepairdecision reads plain or gzipped reports",
+        "Optional: pip install orjson (faster report and cache JSON)",
+        "Optional: pip install Wand (ImageMagick in-process, no identify fork per file)",
+        "Verdicts cached in <case_id>_validation_cache.json (size + mtime + SHA-1 of first 64 KiB)",
+        "Cache is dropped when the tool set or Pillow/Wand/python-magic availability changes",
+        "Files are NOT moved or copied - referenced by path only",
+        "Files are validated concurrently: threads for small sets, processes for large ones",
+        "Install optional tools: sudo apt install jpeginfo pngcheck libtiff-tools",
+    ]},
+]
 
 
 def get_help() -> List[Dict]:
-    return [
-        {"description": [
-            "Forensic file integrity validation - ptlibs compliant",
-            "Two-stage validation: file(1) + ImageMagick + format-specific tools",
-            "Validates files IN-PLACE (no copies created) - no extra disk space needed",
-            "Compliant with NIST SP 800-86 and ISO/IEC 27037:2012",
-        ]},
-        {"usage": ["ptintegrityvalidation <case-id> <consolidated-dir> [options]"]},
-        {"usage_example": [
-            "ptintegrityvalidation CASE-001 /var/forensics/images/CASE-001_consolidated",
-            "ptintegrityvalidation CASE-001 /path/to/consolidated --dry-run",
-            "ptintegrityvalidation CASE-001 /path/to/consolidated --json-out step10.json",
-        ]},
-        {"options": [
-            ["case-id", "", "Forensic case identifier - REQUIRED"],
-            ["consolidated-dir", "", "Path to consolidated directory - REQUIRED"],
-            ["-o", "--output-dir", "<dir>", f"Report output directory (default: {DEFAULT_OUTPUT_DIR})"],
-            ["-a", "--analyst", "<n>", "Analyst name (default: Analyst)"],
-            ["-j", "--json-out", "<f>", "Save JSON report to file"],
-            ["-q", "--quiet", "", "Suppress terminal output"],
-            ["--dry-run", "", "Simulate without reading files"],
-            ["-h", "--help", "", "Show help"],
-            ["--version", "", "Show version"],
-        ]},
-        {"notes": [
-            "Required: file(1) + ImageMagick identify",
-            "Optional: jpeginfo | pngcheck | tiffinfo | PIL fallback",
-            "Output: case_id_integrity_validation.json with per-file classification",
-            "Files are NOT moved or copied - referenced by path only",
-            "Install optional tools: sudo apt install jpeginfo pngcheck libtiff-tools",
-        ]},
-    ]
+    return _HELP
 
 
 def parse_args() -> argparse.Namespace:
@@ -391,6 +869,10 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR)
     parser.add_argument("-a", "--analyst", default="Analyst")
     parser.add_argument("-j", "--json-out", default=None)
+    parser.add_argument("--pretty", action="store_true")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-P", "--processes", action="store_true")
     parser.add_argument("-q", "--quiet", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--version", action="version",
@@ -412,8 +894,7 @@ def main() -> int:
         tool = PtIntegrityValidation(args)
         tool.run()
         tool.save_report()
-        props = json.loads(tool.ptjsonlib.get_result_json())["results"]["properties"]
-        return 0 if props.get("totalFiles", 0) > 0 else 1
+        return 0 if tool.total > 0 else 1
     except KeyboardInterrupt:
         ptprint("Interrupted by user.", "WARNING", condition=True)
         return 130
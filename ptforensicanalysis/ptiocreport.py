@@ -6,7 +6,6 @@
 """
 
 import argparse
-import json
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
@@ -58,7 +57,7 @@ class PtIocReport(ForensicToolBase):
 
     def _load_json(self, path: Path) -> Dict:
         try:
-            raw = json.loads(path.read_text(encoding="utf-8"))
+            raw = self._parse_json(path.read_bytes())
             return raw.get("results", raw.get("result", raw))
         except Exception:
             return {}
@@ -6,10 +6,14 @@
 """
 
 import argparse
-import json
+import gzip
+import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain, count
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -37,13 +41,29 @@ JPEG_SOI = b"\xff\xd8"
 JPEG_EOI = b"\xff\xd9"
 JPEG_SOS = b"\xff\xda"
 JPEG_DQT = b"\xff\xdb"
+JFIF_APP0 = b"\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
 
-try:
-    from PIL import Image, ImageFile
+MAX_DEFAULT_WORKERS = 8
+
+
+@lru_cache(maxsize=None)
+def _load_pil():
+    """Import PIL on first repair that needs it; None if Pillow is not installed."""
+    try:
+        from PIL import Image, ImageFile
+    except ImportError:
+        return None
     ImageFile.LOAD_TRUNCATED_IMAGES = True
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+    return Image
+
+
+def _write_parts(path: Path, parts: List) -> int:
+    """Gather-write JPEG fragments (bytes or memoryview slices), closing with EOI if missing; returns size."""
+    if parts[-1][-2:] != JPEG_EOI:
+        parts.append(JPEG_EOI)
+    with open(path, "wb") as fh:
+        fh.writelines(parts)
+    return sum(len(p) for p in parts)
 
 
 class PtPhotoRepair(ForensicToolBase):
@@ -55,6 +75,7 @@ class PtPhotoRepair(ForensicToolBase):
         self.case_id = self._sanitize_case_id(args.case_id)
         self.analyst = args.analyst
         self.dry_run = args.dry_run
+        self.workers = args.workers
         self.output_dir = Path(args.output_dir)
         try:
             self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -81,7 +102,8 @@ class PtPhotoRepair(ForensicToolBase):
                 return False, "Missing SOI"
             if data.endswith(JPEG_EOI):
                 return True, "EOI already present"
-            path.write_bytes(data + JPEG_EOI)
+            with open(path, "ab") as fh:
+                fh.write(JPEG_EOI)
             return True, f"EOI appended ({len(data)} bytes)"
         except Exception as exc:
             return False, str(exc)
@@ -94,16 +116,13 @@ class PtPhotoRepair(ForensicToolBase):
                 pos = data.find(JPEG_DQT)
             if pos == -1:
                 return False, "No SOS or DQT marker found"
-            app0 = b"\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
-            rebuilt = JPEG_SOI + app0 + data[pos:]
-            if not rebuilt.endswith(JPEG_EOI):
-                rebuilt += JPEG_EOI
-            path.write_bytes(rebuilt)
-            if PIL_AVAILABLE:
-                img = Image.open(str(path))
-                img.load()
-                return True, f"Header rebuilt: {img.width}x{img.height} px"
-            return True, f"Header rebuilt ({len(rebuilt)} bytes)"
+            size = _write_parts(path, [JPEG_SOI, JFIF_APP0, memoryview(data)[pos:]])
+            Image = _load_pil()
+            if Image is not None:
+                with Image.open(str(path)) as img:
+                    img.load()
+                    return True, f"Header rebuilt: {img.width}x{img.height} px"
+            return True, f"Header rebuilt ({size} bytes)"
         except Exception as exc:
             return False, str(exc)
 
@@ -112,49 +131,50 @@ class PtPhotoRepair(ForensicToolBase):
             data = path.read_bytes()
             if not data.startswith(JPEG_SOI):
                 return False, "Missing SOI"
+            view = memoryview(data)
             kept = [JPEG_SOI]
-            pos = 2
-            while pos < len(data) - 1:
-                if data[pos] != 0xFF:
-                    pos += 1
-                    continue
-                marker = data[pos:pos + 2]
-                if marker == JPEG_SOS:
-                    kept.append(data[pos:])
+            sos, eoi = JPEG_SOS[1], JPEG_EOI[1]
+            pos, end = 2, len(data) - 1
+            while pos < end:
+                pos = data.find(b"\xff", pos, end)
+                if pos == -1:
+                    break
+                code = data[pos + 1]
+                if code == sos:
+                    kept.append(view[pos:])
                     break
-                if marker == JPEG_EOI:
+                if code == eoi:
                     kept.append(JPEG_EOI)
                     break
                 if pos + 4 <= len(data):
                     seg_len = int.from_bytes(data[pos + 2:pos + 4], "big")
                     if 2 <= seg_len <= len(data) - pos - 2:
-                        if 0x01 <= data[pos + 1] <= 0xFE:
-                            kept.append(data[pos:pos + 2 + seg_len])
+                        if 0x01 <= code <= 0xFE:
+                            kept.append(view[pos:pos + 2 + seg_len])
                         pos += 2 + seg_len
                         continue
                 pos += 2
-            rebuilt = b"".join(kept)
-            if not rebuilt.endswith(JPEG_EOI):
-                rebuilt += JPEG_EOI
-            path.write_bytes(rebuilt)
-            if PIL_AVAILABLE:
-                img = Image.open(str(path))
-                img.load()
-                return True, f"Segments stripped: {img.width}x{img.height} px"
-            return True, f"Segments stripped ({len(rebuilt)} bytes)"
+            size = _write_parts(path, kept)
+            Image = _load_pil()
+            if Image is not None:
+                with Image.open(str(path)) as img:
+                    img.load()
+                    return True, f"Segments stripped: {img.width}x{img.height} px"
+            return True, f"Segments stripped ({size} bytes)"
         except Exception as exc:
             return False, str(exc)
 
     def _fix_truncated(self, path: Path) -> Tuple[bool, str]:
-        if not PIL_AVAILABLE:
+        Image = _load_pil()
+        if Image is None:
             return self._fix_footer(path)
         tmp = path.with_name(path.stem + "_tmp" + path.suffix)
         try:
-            img = Image.open(str(path))
-            img.load()
-            if img.width == 0 or img.height == 0:
-                return False, "Zero dimensions"
-            img.save(tmp, quality=95)
+            with Image.open(str(path)) as img:
+                img.load()
+                if img.width == 0 or img.height == 0:
+                    return False, "Zero dimensions"
+                img.save(tmp, quality=95)
             shutil.move(str(tmp), str(path))
             return True, f"Truncated recovered: {img.width}x{img.height} px"
         except Exception as exc:
@@ -162,15 +182,16 @@ class PtPhotoRepair(ForensicToolBase):
             return False, str(exc)
 
     def _fix_png(self, path: Path) -> Tuple[bool, str]:
-        if not PIL_AVAILABLE:
+        Image = _load_pil()
+        if Image is None:
             return False, "PIL/Pillow not available"
         tmp = path.with_name(path.stem + "_tmp.png")
         try:
-            img = Image.open(str(path))
-            img.load()
-            if img.width == 0 or img.height == 0:
-                return False, "Zero dimensions"
-            img.save(tmp, optimize=True)
+            with Image.open(str(path)) as img:
+                img.load()
+                if img.width == 0 or img.height == 0:
+                    return False, "Zero dimensions"
+                img.save(tmp, optimize=True)
             shutil.move(str(tmp), str(path))
             return True, f"PNG resaved: {img.width}x{img.height} px"
         except Exception as exc:
@@ -205,6 +226,19 @@ class PtPhotoRepair(ForensicToolBase):
         ok, msg = self._fix_truncated(path)
         return ok, "pil_reopen", msg
 
+    @staticmethod
+    def _claim_path(directory: Path, src: Path) -> Path:
+        """Atomically create an unused name for src in directory: <name>, <stem>_<size>, <stem>_<size>_<n>."""
+        size = src.stat().st_size
+        candidates = chain((directory / src.name, directory / f"{src.stem}_{size}{src.suffix}"),
+                           (directory / f"{src.stem}_{size}_{n}{src.suffix}" for n in count(1)))
+        for dest in candidates:
+            try:
+                os.close(os.open(dest, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                continue
+            return dest
+
     def _repair_single(self, decision: Dict) -> Dict:
         path_s = decision.get("path")
         ctype = decision.get("corruptionType", "unknown")
@@ -219,7 +253,6 @@ class PtPhotoRepair(ForensicToolBase):
         src = Path(path_s) if path_s else None
         if not src or (not self.dry_run and not src.exists()):
             result["message"] = "source not found"
-            self.skipped += 1
             return result
 
         if self.dry_run:
@@ -227,9 +260,7 @@ class PtPhotoRepair(ForensicToolBase):
                            "message": "[DRY-RUN] simulated"})
             return result
 
-        dest = self.repaired_dir / src.name
-        if dest.exists():
-            dest = self.repaired_dir / f"{src.stem}_{src.stat().st_size}{src.suffix}"
+        dest = self._claim_path(self.repaired_dir, src)
         shutil.copy2(str(src), str(dest))
 
         success, method, msg = self._apply_strategy(dest, ctype)
@@ -240,24 +271,33 @@ class PtPhotoRepair(ForensicToolBase):
         else:
             dest.unlink(missing_ok=True)
             if src.exists():
-                shutil.copy2(str(src), str(self.failed_dir / src.name))
+                shutil.copy2(str(src), str(self._claim_path(self.failed_dir, src)))
 
         return result
 
     def load_decisions(self) -> Optional[List[Dict]]:
         ptprint("\n[1/2] Loading repair decisions", "TITLE", condition=self._out())
 
-        if not self.decisions_file.exists() and not self.dry_run:
-            self._fail("decisionsLoad", f"{self.decisions_file.name} not found")
-            return None
-
         if self.dry_run:
             ptprint("  [DRY-RUN] Empty decisions list.", "INFO", condition=self._out())
             self._add_node("decisionsLoad", True, dryRun=True)
             return []
 
+        source = self._newest_existing((self.decisions_file,
+                                        self.decisions_file.with_name(self.decisions_file.name + ".gz")))
+        if source is None:
+            self._fail("decisionsLoad", f"{self.decisions_file.name} not found")
+            return None
+        try:
+            raw = source.read_bytes()
+        except Exception as exc:
+            self._fail("decisionsLoad", f"Cannot read file: {exc}")
+            return None
+
         try:
-            data = json.loads(self.decisions_file.read_text(encoding="utf-8"))
+            if raw[:2] == b"\x1f\x8b":
+                raw = gzip.decompress(raw)
+            data = self._parse_json(raw)
             nodes = data.get("results", {}).get("nodes", [])
             rd = next((n for n in nodes if n.get("type") == "repairDecision"), None)
             decisions = rd["properties"].get("decisions", []) if rd else []
@@ -286,23 +326,11 @@ class PtPhotoRepair(ForensicToolBase):
             self.repaired_dir.mkdir(parents=True, exist_ok=True)
             self.failed_dir.mkdir(parents=True, exist_ok=True)
 
-        for idx, decision in enumerate(decisions, 1):
-            ptprint(f"  [{idx}/{len(decisions)}] {decision.get('filename', '?')} ({decision.get('corruptionType', '?')})",
-                    "INFO", condition=self._out())
-
-            result = self._repair_single(decision)
-            self._results.append(result)
-
-            if result["method"] != "skipped":
-                self.total += 1
-                if result["success"]:
-                    self.repaired += 1
-                else:
-                    self.failed += 1
-                self.by_method[result["method"]] = self.by_method.get(result["method"], 0) + 1
-
-            ptprint(f"    {'✓' if result['success'] else '✗'} {result['method']}: {result.get('message', '')}",
-                    "OK" if result["success"] else "ERROR", condition=self._out())
+        workers = max(1, self.workers or min(2 * (os.cpu_count() or 1), MAX_DEFAULT_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = zip(decisions, pool.map(self._repair_single, decisions))
+            for idx, (decision, result) in enumerate(outcomes, 1):
+                self._tally(idx, len(decisions), decision, result)
 
         ptprint(f"\n  Repaired: {self.repaired}  |  Failed: {self.failed}  |  Skipped: {self.skipped}",
                 "OK", condition=self._out())
@@ -314,6 +342,24 @@ class PtPhotoRepair(ForensicToolBase):
                        byMethod=self.by_method,
                        repairResults=self._results)
 
+    def _tally(self, idx: int, total: int, decision: Dict, result: Dict) -> None:
+        ptprint(f"  [{idx}/{total}] {decision.get('filename', '?')} ({decision.get('corruptionType', '?')})",
+                "INFO", condition=self._out())
+        self._results.append(result)
+
+        if result["method"] == "skipped":
+            self.skipped += 1
+        else:
+            self.total += 1
+            if result["success"]:
+                self.repaired += 1
+            else:
+                self.failed += 1
+            self.by_method[result["method"]] = self.by_method.get(result["method"], 0) + 1
+
+        ptprint(f"    {'✓' if result['success'] else '✗'} {result['method']}: {result.get('message', '')}",
+                "OK" if result["success"] else "ERROR", condition=self._out())
+
     def run(self) -> None:
         ptprint("=" * 70, "TITLE", condition=self._out())
         ptprint(f"PHOTO REPAIR v{__version__}  |  Case: {self.case_id}",
@@ -368,8 +414,7 @@ class PtPhotoRepair(ForensicToolBase):
     def save_report(self) -> Optional[str]:
         if not self.args.json_out:
             return None
-        raw = self.ptjsonlib.get_result_json()
-        Path(self.args.json_out).write_text(raw, encoding="utf-8")
+        self._write_atomic(Path(self.args.json_out), self._dump_json(self.ptjsonlib.json_object))
         ptprint(f"\n✓ JSON report saved: {self.args.json_out}", "OK", condition=True)
         return self.args.json_out
 
@@ -396,6 +441,7 @@ def get_help() -> List[Dict]:
             ["-o", "--output-dir", "<dir>", f"Output directory (default: {DEFAULT_OUTPUT_DIR})"],
             ["-a", "--analyst", "<n>", "Analyst name (default: Analyst)"],
             ["-j", "--json-out", "<f>", "Save JSON report to file"],
+            ["-w", "--workers", "<n>", f"Parallel repair workers (default: 2x CPU threads, max {MAX_DEFAULT_WORKERS})"],
             ["-q", "--quiet", "", "Suppress terminal output"],
             ["--dry-run", "", "Simulate without modifying files"],
             ["-h", "--help", "", "Show help"],
@@ -404,6 +450,7 @@ def get_help() -> List[Dict]:
         {"notes": [
             "JPEG strategies: eoi_append | header_reconstruct | segment_strip | pil_reopen",
             "Failed repairs preserved in <case_id>_repair_failed/ for manual review",
+            "Gzip-compressed decision files are read transparently; if both <file> and <file>.gz exist the newer one is used",
             "Optional: pip install Pillow (required for truncated JPEG and PNG repair)",
         ]},
     ]
@@ -416,6 +463,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR)
     parser.add_argument("-a", "--analyst",    default="Analyst")
     parser.add_argument("-j", "--json-out",   default=None)
+    parser.add_argument("-w", "--workers",    type=int, default=None)
     parser.add_argument("-q", "--quiet",      action="store_true")
     parser.add_argument("--dry-run",          action="store_true")
     parser.add_argument("--version", action="version",
@@ -437,7 +485,7 @@ def main() -> int:
         tool = PtPhotoRepair(args)
         tool.run()
         tool.save_report()
-        props = json.loads(tool.ptjsonlib.get_result_json())["results"]["properties"]
+        props = tool.ptjsonlib.json_object["results"]["properties"]
         return 0 if props.get("repaired", 0) > 0 else 1
     except KeyboardInterrupt:
         ptprint("Interrupted by user.", "WARNING", condition=True)
@@ -7,7 +7,7 @@
 
 import argparse
 import json
-import shutil
+import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
@@ -58,6 +58,8 @@ class PtRecoveryConsolidation(ForensicToolBase):
         self.deduplicated = 0
         self.total = 0
         self.by_format: Dict[str, int] = {}
+        self.by_method: Dict[str, int] = {}
+        self._dest_names: Dict[Path, Set[str]] = {}
 
         self._init_properties(__version__)
 
@@ -68,6 +70,14 @@ class PtRecoveryConsolidation(ForensicToolBase):
         ptprint(f"  {label}: {len(files)} image file(s)", "INFO", condition=self._out())
         return [{"path": f, "sha256": self._file_sha256(f), "source": label} for f in files]
 
+    def _names_in(self, dest_sub: Path) -> Set[str]:
+        """Names taken in a group directory; created and listed once, then tracked in memory."""
+        used = self._dest_names.get(dest_sub)
+        if used is None:
+            dest_sub.mkdir(parents=True, exist_ok=True)
+            used = self._dest_names[dest_sub] = set(os.listdir(dest_sub))
+        return used
+
     def _copy_entry(self, entry: Dict, seen_hashes: Set[str]) -> None:
         fp = entry["path"]
         sha = entry["sha256"]
@@ -81,12 +91,13 @@ class PtRecoveryConsolidation(ForensicToolBase):
 
         dest_sub = self.consolidated_dir / group
         if not self.dry_run:
-            dest_sub.mkdir(parents=True, exist_ok=True)
-        dest = dest_sub / fp.name
-        if not self.dry_run and dest.exists():
-            dest = dest_sub / f"{fp.stem}_{sha[:8] if sha else fp.stem[:8]}{fp.suffix}"
-        if not self.dry_run:
-            shutil.copy2(str(fp), str(dest))
+            used = self._names_in(dest_sub)
+            name = fp.name
+            if name in used:
+                name = f"{fp.stem}_{sha[:8] if sha else fp.stem[:8]}{fp.suffix}"
+            used.add(name)
+            method = self._link_or_copy(fp, dest_sub / name)
+            self.by_method[method] = self.by_method.get(method, 0) + 1
 
         self.total += 1
         self.by_format[group] = self.by_format.get(group, 0) + 1
@@ -156,7 +167,8 @@ class PtRecoveryConsolidation(ForensicToolBase):
                        fromCarving=self.from_carving,
                        deduplicated=self.deduplicated,
                        totalConsolidated=self.total,
-                       byFormat=self.by_format)
+                       byFormat=self.by_format,
+                       byMethod=self.by_method)
         return True
 
     def run(self) -> None:
@@ -178,6 +190,7 @@ class PtRecoveryConsolidation(ForensicToolBase):
             "deduplicated": self.deduplicated,
             "totalConsolidated": self.total,
             "byFormat": self.by_format,
+            "byMethod": self.by_method,
             "consolidatedDir": str(self.consolidated_dir),
         })
         self.ptjsonlib.add_node(self.ptjsonlib.create_node_object(
@@ -236,6 +249,9 @@ def get_help() -> List[Dict]:
             "Use empty string '' to skip an optional directory",
             "Output: case_id_consolidated/<format_group>/",
             "Filesystem-recovered files take priority over carved duplicates",
+            "Files are hardlinked (or reflinked) when on the same filesystem, copied otherwise",
+            "A hardlinked file IS the recovered evidence (same inode) - never edit the consolidated tree in place",
+            "byMethod in the report counts hardlink / reflink / copy_file_range / copy per file",
         ]},
     ]
 
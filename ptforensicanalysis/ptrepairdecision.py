@@ -6,11 +6,19 @@
 """
 
 import argparse
-import json
+import gzip
 import sys
+from collections import Counter
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 try:
     from ._version import __version__
@@ -32,7 +40,10 @@ from ptlibs.ptprinthelper import ptprint
 
 SCRIPTNAME = "ptrepairdecision"
 
-REPAIR_SUCCESS_RATES: Dict[str, float] = {
+NODE_PROPERTIES_PREFIX = "results.nodes.item.properties"
+FILE_RESULTS_PREFIX = f"{NODE_PROPERTIES_PREFIX}.fileResults.item"
+
+REPAIR_SUCCESS_RATES: Mapping[str, float] = MappingProxyType({
     "missing_footer": 90.0,
     "invalid_header": 85.0,
     "corrupt_segments": 60.0,
@@ -43,7 +54,7 @@ REPAIR_SUCCESS_RATES: Dict[str, float] = {
     "corrupted_metadata": 60.0,
     "invalid_structure": 20.0,
     "partial_data": 40.0,
-}
+})
 
 DECISION_RULES = [
     (
@@ -82,6 +93,80 @@ DECISION_RULES = [
 ]
 
 
+def _apply_rules(rate: float) -> Tuple[str, str, str, float]:
+    for rule, test, decision, rationale in DECISION_RULES:
+        if test(rate):
+            return decision, rule, rationale, rate
+    return "SKIP", "R5", "No rule matched.", rate
+
+
+DECISION_TABLE: Mapping[str, Tuple[str, str, str, float]] = MappingProxyType(
+    {ctype: _apply_rules(rate) for ctype, rate in REPAIR_SUCCESS_RATES.items()})
+
+
+def _decide(corruption_type: str) -> Tuple[str, str, str, float]:
+    return DECISION_TABLE.get(corruption_type) or DECISION_TABLE["unknown"]
+
+
+def _collect_repairable(file_results: Iterable[Dict]) -> Tuple[int, Tuple, Tuple, Tuple]:
+    paths: List[Optional[str]] = []
+    names: List[Optional[str]] = []
+    types: List[str] = []
+    add_path, add_name, add_type, intern = paths.append, names.append, types.append, sys.intern
+    count = 0
+    for count, entry in enumerate(file_results, 1):
+        get = entry.get
+        if get("status") == "repairable":
+            add_path(get("path"))
+            add_name(get("filename"))
+            add_type(intern(get("corruptionType") or "unknown"))
+    return count, tuple(paths), tuple(names), tuple(types)
+
+
+def _preflight_total(stream) -> Optional[int]:
+    """totalFiles if the integrityValidation summary (which precedes fileResults) reports nothing repairable, else None."""
+    node_type = total = None
+    for prefix, event, value in ijson.parse(stream):
+        if prefix == "results.nodes.item" and event == "start_map":
+            node_type = total = None
+        elif prefix == "results.nodes.item.type":
+            node_type = value
+        elif node_type != "integrityValidation":
+            continue
+        elif prefix == f"{NODE_PROPERTIES_PREFIX}.totalFiles":
+            total = value
+        elif prefix == f"{NODE_PROPERTIES_PREFIX}.repairableFiles":
+            return total if value == 0 else None
+        elif prefix == f"{NODE_PROPERTIES_PREFIX}.fileResults":
+            return None
+    return None
+
+
+@lru_cache(maxsize=8)
+def _read_repairable(path: str, mtime_ns: int, size: int) -> Tuple[int, Tuple, Tuple, Tuple]:
+    """Parse a validation report once per (path, mtime, size); callers get immutable columns."""
+    if ijson is not None:
+        with open(path, "rb") as fh:
+            gzipped = fh.read(2) == b"\x1f\x8b"
+            fh.seek(0)
+            total = _preflight_total(gzip.GzipFile(fileobj=fh) if gzipped else fh)
+            if total is not None:
+                return total, (), (), ()
+            fh.seek(0)
+            stream = gzip.GzipFile(fileobj=fh) if gzipped else fh
+            return _collect_repairable(ijson.items(stream, FILE_RESULTS_PREFIX, use_float=True))
+    raw = Path(path).read_bytes()
+    if raw[:2] == b"\x1f\x8b":
+        raw = gzip.decompress(raw)
+    data = ForensicToolBase._parse_json(raw)
+    nodes = data.get("results", {}).get("nodes", [])
+    iv = next((n for n in nodes if n.get("type") == "integrityValidation"), None)
+    props = iv["properties"] if iv else {}
+    if props.get("repairableFiles") == 0 and "totalFiles" in props:
+        return props["totalFiles"], (), (), ()
+    return _collect_repairable(props.get("fileResults", []))
+
+
 class PtRepairDecision(ForensicToolBase):
     """Rule-based repair decision engine (R1-R5) - NIST SP 800-86, ISO/IEC 27037:2012."""
 
@@ -103,84 +188,81 @@ class PtRepairDecision(ForensicToolBase):
         self.attempt_repair = 0
         self.manual_review = 0
         self.skip = 0
-        self._decisions: List[Dict] = []
+        self._repair_paths: Tuple[Optional[str], ...] = ()
+        self._repair_names: Tuple[Optional[str], ...] = ()
+        self._repair_types: Tuple[str, ...] = ()
+        self._type_counts: Counter = Counter()
 
         self._init_properties(__version__)
 
     def decide_single(self, corruption_type: str) -> Tuple[str, str, str, float]:
-        rate = REPAIR_SUCCESS_RATES.get(corruption_type, REPAIR_SUCCESS_RATES["unknown"])
-        for rule, test, decision, rationale in DECISION_RULES:
-            if test(rate):
-                return decision, rule, rationale, rate
-        return "SKIP", "R5", "No rule matched.", rate
+        return _decide(corruption_type)
 
-    def _load_validation_file(self) -> Optional[List[Dict]]:
+    def _load_validation_file(self) -> Optional[int]:
+        """Collect repairable entries from the validation report; record count, or None if unreadable."""
         if self.dry_run:
-            return []
-        if not self.validation_file.exists():
-            return None
+            return 0
         try:
-            data = json.loads(self.validation_file.read_text(encoding="utf-8"))
-            nodes = data.get("results", {}).get("nodes", [])
-            iv = next((n for n in nodes if n.get("type") == "integrityValidation"), None)
-            result = iv["properties"].get("fileResults", []) if iv else []
-            ptprint(f"  Loaded: {len(result)} file records from {self.validation_file.name}",
-                    "OK", condition=self._out())
-            return result
+            st = self.validation_file.stat()
+            count, self._repair_paths, self._repair_names, self._repair_types = _read_repairable(
+                str(self.validation_file), st.st_mtime_ns, st.st_size)
         except Exception:
             return None
-
-    def _run_decisions(self, repairable: List[Dict]) -> None:
-        ptprint(f"  Repairable files: {len(repairable)}", "INFO", condition=self._out())
-        for entry in repairable:
-            ctype = entry.get("corruptionType", "unknown")
+        ptprint(f"  Loaded: {count} file records from {self.validation_file.name}",
+                "OK", condition=self._out())
+        return count
+
+    def _run_decisions(self) -> None:
+        ptprint(f"  Repairable files: {len(self._repair_types)}", "INFO", condition=self._out())
+        self._type_counts = Counter(self._repair_types)
+        tally: Counter = Counter()
+        for ctype, count in self._type_counts.items():
+            tally[self.decide_single(ctype)[0]] += count
+        self.total = len(self._repair_types)
+        self.attempt_repair = tally["ATTEMPT_REPAIR"]
+        self.manual_review = tally["MANUAL_REVIEW"]
+        self.skip = self.total - self.attempt_repair - self.manual_review
+
+    def _decision_rows(self) -> Iterator[Dict]:
+        shared: Dict[str, Dict] = {}
+        for ctype in self._type_counts:
             decision, rule, rationale, rate = self.decide_single(ctype)
-            self.total += 1
-            if decision == "ATTEMPT_REPAIR":
-                self.attempt_repair += 1
-            elif decision == "MANUAL_REVIEW":
-                self.manual_review += 1
-            else:
-                self.skip += 1
-            self._decisions.append({
-                "path": entry.get("path"),
-                "filename": entry.get("filename"),
+            shared[ctype] = {
                 "corruptionType": ctype,
                 "successRatePct": rate,
                 "decision": decision,
                 "ruleApplied": rule,
                 "rationale": rationale,
-            })
+            }
+        for path, name, ctype in zip(self._repair_paths, self._repair_names, self._repair_types):
+            yield {"path": path, "filename": name, **shared[ctype]}
 
     def _print_decision_summary(self) -> None:
         ptprint(f"\n  Total repairable: {self.total}  |  Attempt repair: {self.attempt_repair}  |  Manual review: {self.manual_review}  |  Skip: {self.skip}",
                 "OK", condition=self._out())
 
-        ptprint("\n  Decision breakdown by corruption type:",
-                "INFO", condition=self._out())
-        seen: Dict[str, Dict] = {}
-        for d in self._decisions:
-            ct = d["corruptionType"]
-            if ct not in seen:
-                seen[ct] = {
-                    "count": 0, "decision": d["decision"],
-                    "rate": d["successRatePct"], "rule": d["ruleApplied"],
-                }
-            seen[ct]["count"] += 1
-        for ct, info in sorted(seen.items()):
-            ptprint(f"  {info['count']}x {ct:<22s} -> {info['decision']:<15s} (rate={info['rate']:.0f}%, {info['rule']})",
-                    "INFO", condition=self._out())
+        if not self._out():
+            return
+        lines = ["\n  Decision breakdown by corruption type:"]
+        for ct, count in sorted(self._type_counts.items()):
+            decision, rule, _, rate = self.decide_single(ct)
+            lines.append(f"  {count}x {ct:<22s} -> {decision:<15s} (rate={rate:.0f}%, {rule})")
+        ptprint("\n".join(lines), "INFO", condition=True)
 
     def process_validation_report(self) -> bool:
         ptprint("\n[1/1] Processing integrity validation report",
                 "TITLE", condition=self._out())
 
-        file_results = self._load_validation_file()
-        if file_results is None:
+        if self._load_validation_file() is None:
             return self._fail("repairDecision", f"{self.validation_file.name} not found or unreadable - run Integrity Validation first.")
 
-        repairable = [r for r in file_results if r.get("status") == "repairable"]
-        self._run_decisions(repairable)
+        if not self._repair_types:
+            ptprint("  Repairable files: 0 - no decisions needed.", "INFO", condition=self._out())
+            self._add_node("repairDecision", True, totalRepairable=0, attemptRepair=0,
+                           manualReview=0, skip=0, decisions=[])
+            return True
+
+        self._run_decisions()
         self._print_decision_summary()
 
         self._add_node("repairDecision", True,
@@ -188,7 +270,7 @@ class PtRepairDecision(ForensicToolBase):
                        attemptRepair=self.attempt_repair,
                        manualReview=self.manual_review,
                        skip=self.skip,
-                       decisions=self._decisions)
+                       decisions=list(self._decision_rows()))
         return True
 
 
@@ -213,7 +295,7 @@ class PtRepairDecision(ForensicToolBase):
             "attemptRepair": self.attempt_repair,
             "manualReview": self.manual_review,
             "skip": self.skip,
-            "repairRates": REPAIR_SUCCESS_RATES,
+            "repairRates": dict(REPAIR_SUCCESS_RATES),
         })
         self.ptjsonlib.add_node(self.ptjsonlib.create_node_object(
             "chainOfCustodyEntry",
@@ -235,10 +317,15 @@ class PtRepairDecision(ForensicToolBase):
     def save_report(self) -> Optional[str]:
         if not self.args.json_out:
             return None
-        raw = self.ptjsonlib.get_result_json()
-        Path(self.args.json_out).write_text(raw, encoding="utf-8")
-        ptprint(f"\n✓ JSON report saved: {self.args.json_out}", "OK", condition=True)
-        return self.args.json_out
+        json_out = self.args.json_out
+        data = self._dump_json(self.ptjsonlib.json_object)
+        if self.args.gzip and not json_out.endswith(".gz"):
+            json_out += ".gz"
+        if json_out.endswith(".gz"):
+            data = gzip.compress(data, compresslevel=1)
+        self._write_atomic(Path(json_out), data)
+        ptprint(f"\n✓ JSON report saved: {json_out}", "OK", condition=True)
+        return json_out
 
 
 def get_help() -> List[Dict]:
@@ -261,6 +348,7 @@ def get_help() -> List[Dict]:
             ["-o", "--output-dir", "<dir>", f"Report output directory (default: {DEFAULT_OUTPUT_DIR})"],
             ["-a", "--analyst", "<n>", "Analyst name (default: Analyst)"],
             ["-j", "--json-out", "<f>", "Save JSON report to file"],
+            ["--gzip", "", "Gzip the JSON report (.gz appended if missing)"],
             ["-q", "--quiet", "", "Suppress terminal output"],
             ["--dry-run", "", "Simulate without reading files"],
             ["-h", "--help", "", "Show help"],
@@ -270,7 +358,9 @@ def get_help() -> List[Dict]:
             "R1 (>=85%): ATTEMPT_REPAIR | R2 (50-84%): ATTEMPT_REPAIR",
             "R3 (30-49%): MANUAL_REVIEW | R4-R5 (<30%): SKIP",
             "Output: case_id_repair_decisions.json",
+            "A --json-out ending in .gz is always gzipped; ptphotorepair reads the newer of <file> and <file>.gz",
             "Pure analytical step - no files are moved or modified",
+            "Optional: pip install ijson (streams fileResults instead of loading the whole report)",
         ]},
     ]
 
@@ -282,6 +372,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR)
     parser.add_argument("-a", "--analyst", default="Analyst")
     parser.add_argument("-j", "--json-out", default=None)
+    parser.add_argument("--gzip", action="store_true")
     parser.add_argument("-q", "--quiet", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--version", action="version",
@@ -303,7 +394,7 @@ def main() -> int:
         tool = PtRepairDecision(args)
         tool.run()
         tool.save_report()
-        props = json.loads(tool.ptjsonlib.get_result_json())["results"]["properties"]
+        props = tool.ptjsonlib.json_object["results"]["properties"]
         return 0 if "totalRepairable" in props else 1
     except KeyboardInterrupt:
         ptprint("Interrupted by user.", "WARNING", condition=True)
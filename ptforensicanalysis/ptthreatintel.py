@@ -6,7 +6,6 @@
 """
 
 import argparse
-import json
 import os
 import sys
 import time
@@ -76,7 +75,7 @@ class PtThreatIntel(ForensicToolBase):
         try:
             req = Request(url, headers=headers)
             with urlopen(req, timeout=30) as resp:
-                return json.loads(resp.read().decode("utf-8"))
+                return self._parse_json(resp.read())
         except HTTPError as e:
             ptprint(f"  HTTP {e.code}: {url[:60]}", "WARNING", condition=self._out())
             return None
@@ -95,7 +94,7 @@ class PtThreatIntel(ForensicToolBase):
             return True
 
         try:
-            raw = json.loads(self.ioc_file.read_text(encoding="utf-8"))
+            raw = self._parse_json(self.ioc_file.read_bytes())
             data = raw.get("results", raw.get("result", raw))
             props = data.get("properties", data)
             self.ioc_data = props.get("iocReport", props).get("ioc", {})
@@ -6,7 +6,8 @@
 # Validates merging of filesystem-recovery (branch 9a) and file-carving
 # (branch 9b) outputs with FS-priority deduplication (chapter 4.5.5).
 #
-# Coverage: 18 tests in 5 categories per chapter 5.4.2 of the thesis.
+# Coverage: 18 tests in 5 categories per chapter 5.4.2 of the thesis,
+# plus category F for the hardlink/copy behaviour of the consolidated tree.
 #
 # Author:  Bc. Dominik Sabota, VUT FEKT Brno, 2026
 # License: GPL-3.0
@@ -270,6 +271,124 @@ test_e_exit_codes() {
     assert_exit_code "E2: empty -> 1" "${EXIT_FAILURE}" "${code}"
 }
 
+# =============================================================================
+# F: Link / copy into the consolidated tree
+# =============================================================================
+
+# -----------------------------------------------------------------------------
+# link_or_copy <src> <dst> [nolink]
+# Calls ForensicToolBase._link_or_copy directly and prints the method it
+# used, or "exists" on FileExistsError. With "nolink", os.link fails with
+# EXDEV as it would across filesystems, forcing the reflink/copy path.
+# -----------------------------------------------------------------------------
+link_or_copy() {
+    python3 - "${TOOLS_DIR}" "$1" "$2" "${3:-}" <<'EOF'
+import errno, os, sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+from ptforensictoolbase import ForensicToolBase
+if sys.argv[4] == "nolink":
+    def _no_link(*_a, **_k):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+    os.link = _no_link
+try:
+    print(ForensicToolBase._link_or_copy(Path(sys.argv[2]), Path(sys.argv[3])))
+except FileExistsError:
+    print("exists")
+EOF
+}
+
+sha_of() { sha256sum "$1" | cut -d' ' -f1; }
+
+test_f_link_or_copy() {
+    test_header "Category F: Link / copy into the consolidated tree"
+
+    setup_overlap_fixture
+    local src="${TEST_DIR}/fs/active/IMG_0001.JPG"
+    local src_sha
+    src_sha=$(sha_of "${src}")
+
+    local out="${TEST_DIR}/f1.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" "${out}" >/dev/null
+    local cdir="${TEST_DIR}/consolidated/${PREFIX_PHOTO}-2026-01-01-001_consolidated"
+    local dst="${cdir}/jpeg/IMG_0001.JPG"
+
+    # F1: inputs and output share a filesystem, so every file is a hardlink
+    # and the report says so.
+    assert_json_field "F1: byMethod = 6 hardlinks" "${out}" \
+        "d['results']['properties'].get('byMethod')" "{'hardlink': 6}"
+
+    # F2: the consolidated file is the recovered file itself: same inode,
+    # two links, same content.
+    if [ "$(stat -c %i "${src}")" = "$(stat -c %i "${dst}")" ] \
+            && [ "$(stat -c %h "${src}")" = "2" ]; then
+        pass "F2: hardlink shares the inode (st_nlink=2)"
+    else
+        fail "F2: hardlink inode" \
+            "src ino=$(stat -c %i "${src}") nlink=$(stat -c %h "${src}"), dst ino=$(stat -c %i "${dst}")"
+    fi
+
+    # F3: consolidating did not change the evidence.
+    assert_equal "F3: source SHA-256 unchanged" "${src_sha}" "$(sha_of "${src}")"
+
+    # F4: the carved duplicate was not linked in, so it still has one link.
+    assert_equal "F4: deduplicated carved file untouched (st_nlink=1)" \
+        "1" "$(stat -c %h "${TEST_DIR}/carved/valid/f00001.jpg")"
+
+    # F5: an existing destination is an error, not an overwrite.
+    local taken="${TEST_DIR}/taken.jpg"
+    make_jpeg "${taken}" 9
+    local taken_sha
+    taken_sha=$(sha_of "${taken}")
+    assert_equal "F5a: hardlink onto existing file -> FileExistsError" \
+        "exists" "$(link_or_copy "${src}" "${taken}")"
+    assert_equal "F5b: copy onto existing file -> FileExistsError" \
+        "exists" "$(link_or_copy "${src}" "${taken}" nolink)"
+    assert_equal "F5c: existing file left as it was" "${taken_sha}" "$(sha_of "${taken}")"
+
+    # F6: without a hardlink the result is an independent file with the same
+    # content, and the source keeps its single link.
+    local lone="${TEST_DIR}/lone.jpg" copied="${TEST_DIR}/copied.jpg"
+    make_jpeg "${lone}" 7
+    rm -f "${copied}"
+    local method
+    method=$(link_or_copy "${lone}" "${copied}" nolink)
+    case "${method}" in
+        reflink|copy_file_range|copy) pass "F6a: no hardlink -> ${method}" ;;
+        *) fail "F6a: no hardlink -> reflink/copy" "got: '${method}'" ;;
+    esac
+    if [ "$(stat -c %i "${lone}")" != "$(stat -c %i "${copied}")" ] \
+            && [ "$(stat -c %h "${lone}")" = "1" ] \
+            && [ "$(sha_of "${lone}")" = "$(sha_of "${copied}")" ]; then
+        pass "F6b: copy is a separate inode with identical content"
+    else
+        fail "F6b: copy inode/content" "src ino=$(stat -c %i "${lone}"), dst ino=$(stat -c %i "${copied}")"
+    fi
+
+    # F7: a name already present in the consolidated tree from an earlier run
+    # is kept; the new file gets a hash-suffixed name next to it.
+    rm -rf "${TEST_DIR}/fs" "${TEST_DIR}/carved"
+    mkdir -p "${TEST_DIR}/fs/active" "${TEST_DIR}/carved"
+    make_jpeg "${TEST_DIR}/fs/active/IMG_0001.JPG" 11
+    local pdir="${TEST_DIR}/consolidated/${PREFIX_PHOTO}-2026-01-01-002_consolidated/jpeg"
+    rm -rf "${pdir%/jpeg}"
+    mkdir -p "${pdir}"
+    make_jpeg "${pdir}/IMG_0001.JPG" 12
+    local prev_sha
+    prev_sha=$(sha_of "${pdir}/IMG_0001.JPG")
+    invoke_tool "${TOOL_PATH}" "${PREFIX_PHOTO}-2026-01-01-002" "${TEST_DIR}/fs" "" \
+        --output-dir "${TEST_DIR}/consolidated" --json-out "${TEST_DIR}/f7.json" \
+        >/dev/null 2>&1
+    local renamed
+    renamed=$(find "${pdir}" -name 'IMG_0001_*.JPG' | wc -l)
+    if [ "$(sha_of "${pdir}/IMG_0001.JPG")" = "${prev_sha}" ] && [ "${renamed}" = "1" ]; then
+        pass "F7: earlier file kept, new one written under a suffixed name"
+    else
+        fail "F7: name collision with earlier run" \
+            "earlier file changed or renamed copies=${renamed}"
+    fi
+}
+
 main() {
     check_prerequisites "3.10" "${TOOL_PATH}"
     rm -rf "${TEST_DIR}"
@@ -280,6 +399,7 @@ main() {
     test_c_boundaries
     test_d_json_structure
     test_e_exit_codes
+    test_f_link_or_copy
     print_summary "ptrecoveryconsolidation"
 }
 
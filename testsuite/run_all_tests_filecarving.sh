@@ -174,8 +174,8 @@ make_mock_identify() {
 #!/bin/sh
 # Mock ImageMagick identify. Returns success for files that exist and
 # contain known image signatures.
-FILE="$1"
-[ "$1" = "-format" ] && FILE="$3"
+# The file is the last argument, after any -ping / -format options.
+for FILE in "$@"; do :; done
 [ -f "${FILE}" ] || exit 1
 # Peek first bytes
 HEADER=$(head -c 4 "${FILE}" | od -An -tx1 | tr -d ' \n')
@@ -109,8 +109,8 @@ make_mock_identify() {
 #!/bin/sh
 # Mock ImageMagick identify. Returns success for files whose first 4 bytes
 # match a known JPEG/PNG signature.
-FILE="$1"
-[ "$1" = "-format" ] && FILE="$3"
+# The file is the last argument, after any -ping / -format options.
+for FILE in "$@"; do :; done
 [ -f "${FILE}" ] || exit 1
 HEADER=$(head -c 4 "${FILE}" | od -An -tx1 | tr -d ' \n')
 case "${HEADER}" in
@@ -85,6 +85,11 @@ test_a_static_helpers() {
     result=$(py_harness "t._file_sha256('${TEST_DIR}/abc')")
     assert_equal "A4: SHA-256 of 'abc' (FIPS 180-4 B.1)" \
         "${NIST_SHA256_ABC}" "${result}"
+
+    # A5: atomic write replaces content and leaves no temp file behind
+    printf 'old' > "${TEST_DIR}/atomic.json"
+    result=$(py_harness "t._write_atomic(Path('${TEST_DIR}/atomic.json'), b'new') or (Path('${TEST_DIR}/atomic.json').read_text(), len(os.listdir('${TEST_DIR}')))")
+    assert_equal "A5: atomic write replaces file, no temp left" "('new', 3)" "${result}"
 }
 
 # =============================================================================
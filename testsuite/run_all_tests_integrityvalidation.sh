@@ -96,7 +96,7 @@ FILE="$1"
 [ -f "$FILE" ] || exit 1
 HEAD=$(head -c 4 "$FILE" | od -An -tx1 | tr -d ' \n')
 case "$HEAD" in
-    49492a00|4d4d002a)
+    49492a00|4d4d002a|49492b00|4d4d002b)
         echo "TIFF Directory at offset 0x8"
         echo "Image Width: 100  Image Length: 100"
         exit 0
@@ -112,16 +112,28 @@ make_mock_identify() {
     mkdir -p "${MOCK_BIN}"
     cat > "${MOCK_BIN}/identify" <<'EOF'
 #!/bin/sh
-FILE="$1"
-[ "$1" = "-format" ] && FILE="$3"
-[ -f "$FILE" ] || exit 1
-HEAD=$(head -c 4 "$FILE" | od -An -tx1 | tr -d ' \n')
-case "$HEAD" in
-    ffd8ff*)   echo "$FILE JPEG 100x100"; exit 0 ;;
-    89504e47)  echo "$FILE PNG 100x100"; exit 0 ;;
-    49492a00|4d4d002a) echo "$FILE TIFF 100x100"; exit 0 ;;
-    *) exit 1 ;;
-esac
+# Accepts several paths per call, like identify(1); -format switches to "path<TAB>type<TAB>geometry".
+FMT=""
+RC=0
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -format) FMT=1; shift 2; continue ;;
+        -*) shift; continue ;;
+    esac
+    FILE="$1"; shift
+    TYPE=""
+    if [ -f "$FILE" ]; then
+        case $(head -c 4 "$FILE" | od -An -tx1 | tr -d ' \n') in
+            ffd8ff*)   TYPE=JPEG ;;
+            89504e47)  TYPE=PNG ;;
+            49492a00|4d4d002a|49492b00|4d4d002b) TYPE=TIFF ;;
+        esac
+    fi
+    if [ -z "$TYPE" ]; then RC=1; continue; fi
+    if [ -n "$FMT" ]; then printf '%s\t%s\t100x100\n' "$FILE" "$TYPE"
+    else echo "$FILE $TYPE 100x100"; fi
+done
+exit $RC
 EOF
     chmod +x "${MOCK_BIN}/identify"
 }
@@ -130,17 +142,23 @@ make_mock_file() {
     mkdir -p "${MOCK_BIN}"
     cat > "${MOCK_BIN}/file" <<'EOF'
 #!/bin/sh
-FILE=""
+# Accepts several paths per call, like file(1); -0 ends each name with NUL.
+SEP=""
 for arg in "$@"; do
-    case "$arg" in -*) ;; *) FILE="$arg" ;; esac
+    case "$arg" in -0|--print0) SEP='\0' ;; esac
+done
+for FILE in "$@"; do
+    case "$FILE" in -*) continue ;; esac
+    HEAD=$(head -c 4 "$FILE" 2>/dev/null | od -An -tx1 | tr -d ' \n')
+    case "$HEAD" in
+        ffd8ff*)   DESC="JPEG image data" ;;
+        89504e47)  DESC="PNG image data" ;;
+        49492a00)  DESC="TIFF image data, little-endian" ;;
+        49492b00)  DESC="Big TIFF image data, little-endian" ;;
+        *)         DESC="data" ;;
+    esac
+    printf "%s${SEP}: %s\n" "$FILE" "$DESC"
 done
-HEAD=$(head -c 4 "$FILE" 2>/dev/null | od -An -tx1 | tr -d ' \n')
-case "$HEAD" in
-    ffd8ff*)   echo "$FILE: JPEG image data" ;;
-    89504e47)  echo "$FILE: PNG image data" ;;
-    49492a00)  echo "$FILE: TIFF image data, little-endian" ;;
-    *)         echo "$FILE: data" ;;
-esac
 EOF
     chmod +x "${MOCK_BIN}/file"
 }
@@ -352,6 +370,61 @@ sum(1 for n in d['results']['nodes']
         "d['results']['properties'].get('totalFiles', 0)")
     # The .xyz file should not be counted; expect 1 (the .jpg).
     assert_equal "C3: unknown extension skipped" "1" "${total}"
+
+    # C4: JPEG with a valid SOI but below the per-format minimum size
+    # (FORMAT_MIN_BYTES[".jpg"] = 125) is short-circuited by _precheck as
+    # corrupted/truncated before any external tool runs.
+    rm -rf "${TEST_DIR}/in"
+    mkdir -p "${TEST_DIR}/in"
+    {
+        printf '\xff\xd8\xff\xe0'
+        python3 -c "import sys; sys.stdout.buffer.write(b'\xaa' * 100)"
+    } > "${TEST_DIR}/in/stub.jpg"
+    out="${TEST_DIR}/c4.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-004" "${TEST_DIR}/in" "${out}" >/dev/null
+    local stub_classified
+    stub_classified=$(json_value "${out}" "
+sum(1 for n in d['results']['nodes']
+    if n.get('type') == 'integrityValidation'
+    for f in n.get('properties', {}).get('fileResults', [])
+    if f.get('filename') == 'stub.jpg'
+    and f.get('status') == 'corrupted'
+    and f.get('corruptionType') == 'truncated')")
+    assert_equal "C4: undersized JPEG -> corrupted/truncated" "1" "${stub_classified}"
+
+    # C5: carver false positive - a .jpg larger than any size threshold whose
+    # first bytes match no known image signature (here a ZIP header) is
+    # rejected by the magic sniff as corrupted/invalid_header.
+    rm -rf "${TEST_DIR}/in"
+    mkdir -p "${TEST_DIR}/in"
+    {
+        printf 'PK\x03\x04'
+        python3 -c "import sys; sys.stdout.buffer.write(b'\xaa' * 4096)"
+    } > "${TEST_DIR}/in/carved.jpg"
+    out="${TEST_DIR}/c5.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-005" "${TEST_DIR}/in" "${out}" >/dev/null
+    local sniff_classified
+    sniff_classified=$(json_value "${out}" "
+sum(1 for n in d['results']['nodes']
+    if n.get('type') == 'integrityValidation'
+    for f in n.get('properties', {}).get('fileResults', [])
+    if f.get('filename') == 'carved.jpg'
+    and f.get('status') == 'corrupted'
+    and f.get('corruptionType') == 'invalid_header')")
+    assert_equal "C5: non-image signature -> corrupted/invalid_header" "1" "${sniff_classified}"
+
+    # C6: a BigTIFF (II+\0) named .tif is not in the classic TIFF sniff
+    # set; it must reach file(1)/tiffinfo and come out valid.
+    rm -rf "${TEST_DIR}/in"
+    mkdir -p "${TEST_DIR}/in"
+    {
+        printf 'II+\x00\x08\x00\x00\x00'
+        python3 -c "import sys; sys.stdout.buffer.write(b'\xaa' * 200)"
+    } > "${TEST_DIR}/in/big.tif"
+    out="${TEST_DIR}/c6.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-006" "${TEST_DIR}/in" "${out}" >/dev/null
+    assert_json_field "C6: BigTIFF .tif -> valid" "${out}" \
+        "d['results']['properties'].get('validFiles', 0)" "1"
 }
 
 # =============================================================================
@@ -421,6 +494,292 @@ test_e_exit_codes() {
     esac
 }
 
+# =============================================================================
+# F: In-process validators (no jpeginfo / pngcheck / tiffinfo)
+# =============================================================================
+
+# -----------------------------------------------------------------------------
+# setup_minimal_bin
+# Builds ${MIN_BIN}: the file/identify mocks plus only the utilities the
+# mocks and the tool need. Running with PATH=${MIN_BIN} guarantees the
+# optional validators are absent even if installed on the host, so the
+# verdicts come from _validate_png_chunks / _validate_jpeg_footer.
+# -----------------------------------------------------------------------------
+MIN_BIN="${TEST_DIR}/min_bin"
+
+setup_minimal_bin() {
+    setup_all_mocks
+    rm -rf "${MIN_BIN}"
+    mkdir -p "${MIN_BIN}"
+    cp "${MOCK_BIN}/file" "${MOCK_BIN}/identify" "${MIN_BIN}/"
+    local util
+    for util in sh head od tr; do
+        ln -s "$(command -v "${util}")" "${MIN_BIN}/${util}"
+    done
+    ln -s "$(python3 -c 'import sys; print(sys.executable)')" "${MIN_BIN}/python3"
+}
+
+run_tool_minimal() {
+    local case_id="$1"
+    local input_dir="$2"
+    local out="$3"
+    local code=0
+    PATH="${MIN_BIN}" \
+        invoke_tool "${TOOL_PATH}" "${case_id}" "${input_dir}" \
+            --analyst "Test" \
+            --json-out "${out}" \
+            >/dev/null 2>&1 || code=$?
+    echo "${code}"
+}
+
+# -----------------------------------------------------------------------------
+# file_verdict <json_file> <filename>
+# Prints "<status>/<corruptionType>" for one entry of fileResults.
+# -----------------------------------------------------------------------------
+file_verdict() {
+    json_value "$1" "
+next((f['status'] + '/' + f['corruptionType'] for n in d['results']['nodes']
+      if n.get('type') == 'integrityValidation'
+      for f in n.get('properties', {}).get('fileResults', [])
+      if f.get('filename') == '$2'), '')"
+}
+
+test_f_inprocess_validators() {
+    test_header "Category F: In-process validators"
+
+    setup_minimal_bin
+    rm -rf "${TEST_DIR}/in"
+    mkdir -p "${TEST_DIR}/in"
+    python3 - <<PYEOF
+import os, struct, zlib
+d = "${TEST_DIR}/in"
+
+def chunk(ctype, data):
+    return (struct.pack(">I", len(data)) + ctype + data
+            + struct.pack(">I", zlib.crc32(ctype + data)))
+
+ihdr = chunk(b"IHDR", struct.pack(">IIBBBBB", 16, 16, 8, 2, 0, 0, 0))
+idat = chunk(b"IDAT", zlib.compress(os.urandom(16 * (1 + 16 * 3)), 0))
+png = b"\x89PNG\r\n\x1a\n" + ihdr + idat + chunk(b"IEND", b"")
+open(f"{d}/ok.png", "wb").write(png)
+
+# Flip one byte of the IDAT CRC.
+crc_at = 8 + len(ihdr) + len(idat) - 1
+open(f"{d}/bad_crc.png", "wb").write(png[:crc_at] + bytes([png[crc_at] ^ 0xFF]) + png[crc_at + 1:])
+
+# Cut the file halfway through the IDAT payload.
+open(f"{d}/cut_idat.png", "wb").write(png[:8 + len(ihdr) + len(idat) // 2])
+
+app0 = b"\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+# DQT whose length field (1) is below the 2-byte minimum.
+open(f"{d}/bad_len.jpg", "wb").write(b"\xff\xd8" + app0 + b"\xff\xdb\x00\x01" + b"\xaa" * 200 + b"\xff\xd9")
+open(f"{d}/no_eoi.jpg", "wb").write(b"\xff\xd8" + app0 + b"\xff\xdb\x00\x43" + b"\x01" * 0x41 + b"\xaa" * 200)
+PYEOF
+
+    local out="${TEST_DIR}/f.json"
+    run_tool_minimal "${PREFIX_PHOTO}-2026-01-01-001" "${TEST_DIR}/in" "${out}" >/dev/null
+
+    assert_equal "F1: clean PNG -> valid/none" \
+        "valid/none" "$(file_verdict "${out}" ok.png)"
+    assert_equal "F2: flipped IDAT CRC byte -> repairable/corrupt_segments" \
+        "repairable/corrupt_segments" "$(file_verdict "${out}" bad_crc.png)"
+    assert_equal "F3: truncated IDAT -> repairable/truncated" \
+        "repairable/truncated" "$(file_verdict "${out}" cut_idat.png)"
+    assert_equal "F4: JPEG marker length < 2 -> repairable/corrupt_segments" \
+        "repairable/corrupt_segments" "$(file_verdict "${out}" bad_len.jpg)"
+    assert_equal "F5: JPEG without EOI -> repairable/missing_footer" \
+        "repairable/missing_footer" "$(file_verdict "${out}" no_eoi.jpg)"
+
+    # F6: a clean JPEG walks to SOS and is then confirmed by a PIL decode,
+    # so it needs Pillow in the interpreter the tool runs under.
+    if ! python3 -c 'from PIL import Image' 2>/dev/null; then
+        printf '[SKIP] PIL/Pillow not installed; F6 skipped\n'
+        return 0
+    fi
+    python3 -c "
+from PIL import Image
+Image.new('RGB', (64, 64), color=(10, 200, 30)).save('${TEST_DIR}/in/ok.jpg', 'JPEG')
+"
+    run_tool_minimal "${PREFIX_PHOTO}-2026-01-01-002" "${TEST_DIR}/in" "${out}" >/dev/null
+    assert_equal "F6: clean JPEG -> valid/none" \
+        "valid/none" "$(file_verdict "${out}" ok.jpg)"
+}
+
+# =============================================================================
+# G: Verdict cache
+# =============================================================================
+
+# -----------------------------------------------------------------------------
+# poison_cache <cache_file>
+# Rewrites every cached verdict to corrupted/unknown, a result the mocks
+# never produce for the fixture, so seeing it in a report proves the
+# verdict came from the cache.
+# -----------------------------------------------------------------------------
+poison_cache() {
+    python3 - <<PYEOF
+import json
+data = json.load(open("$1"))
+for entry in data["entries"].values():
+    entry["result"].update(status="corrupted", corruptionType="unknown")
+open("$1", "w").write(json.dumps(data))
+PYEOF
+}
+
+# -----------------------------------------------------------------------------
+# rewrite_keep_mtime <file> <python_expr_over_data>
+# Replaces the file content with <expr> (bytes, `data` = old content)
+# and restores the original mtime to the nanosecond.
+# -----------------------------------------------------------------------------
+rewrite_keep_mtime() {
+    python3 - <<PYEOF
+import os
+st = os.stat("$1")
+data = open("$1", "rb").read()
+open("$1", "wb").write($2)
+os.utime("$1", ns=(st.st_atime_ns, st.st_mtime_ns))
+PYEOF
+}
+
+run_tool_cached() {
+    PATH="${MOCK_BIN}:${PATH}" \
+        invoke_tool "${TOOL_PATH}" "${PREFIX_PHOTO}-2026-01-01-009" "${TEST_DIR}/in" \
+            --analyst "Test" \
+            --output-dir "${TEST_DIR}/out" \
+            --json-out "$1" \
+            >/dev/null 2>&1
+}
+
+test_g_verdict_cache() {
+    test_header "Category G: Verdict cache"
+
+    setup_all_mocks
+    rm -rf "${TEST_DIR}/in" "${TEST_DIR}/out"
+    mkdir -p "${TEST_DIR}/in"
+    make_valid_png "${TEST_DIR}/in/p.png"
+    local cache="${TEST_DIR}/out/${PREFIX_PHOTO}-2026-01-01-009_validation_cache.json"
+    local out="${TEST_DIR}/g.json"
+
+    run_tool_cached "${out}"
+    assert_equal "G1: first run -> valid/none" "valid/none" "$(file_verdict "${out}" p.png)"
+
+    # G2: unchanged file -> verdict served from the cache.
+    poison_cache "${cache}"
+    run_tool_cached "${out}"
+    assert_equal "G2: unchanged file -> cache hit" \
+        "corrupted/unknown" "$(file_verdict "${out}" p.png)"
+
+    # G3: new mtime -> revalidated.
+    touch -d "1 hour ago" "${TEST_DIR}/in/p.png"
+    run_tool_cached "${out}"
+    assert_equal "G3: mtime change -> revalidated" "valid/none" "$(file_verdict "${out}" p.png)"
+
+    # G4: size change with the mtime held -> revalidated.
+    poison_cache "${cache}"
+    rewrite_keep_mtime "${TEST_DIR}/in/p.png" 'data + b"\xaa"'
+    run_tool_cached "${out}"
+    assert_equal "G4: size change (same mtime) -> revalidated" \
+        "valid/none" "$(file_verdict "${out}" p.png)"
+
+    # G5: one byte flipped in the head, same size and mtime -> the head
+    # SHA-1 differs -> revalidated.
+    poison_cache "${cache}"
+    rewrite_keep_mtime "${TEST_DIR}/in/p.png" 'data[:20] + bytes([data[20] ^ 0xFF]) + data[21:]'
+    run_tool_cached "${out}"
+    assert_equal "G5: head SHA-1 change (same size+mtime) -> revalidated" \
+        "valid/none" "$(file_verdict "${out}" p.png)"
+
+    # G6: decoder availability recorded in the cache header differs from
+    # this run (e.g. Pillow installed since) -> whole cache dropped.
+    poison_cache "${cache}"
+    python3 - <<PYEOF
+import json
+data = json.load(open("${cache}"))
+data["decoders"]["pil"] = "0.0-other"
+open("${cache}", "w").write(json.dumps(data))
+PYEOF
+    run_tool_cached "${out}"
+    assert_equal "G6: decoder set changed -> cache dropped" \
+        "valid/none" "$(file_verdict "${out}" p.png)"
+}
+
+# =============================================================================
+# H: Batched identify
+# =============================================================================
+
+# -----------------------------------------------------------------------------
+# make_logging_identify <log_file>
+# Like make_mock_identify, but appends the number of files each call was
+# given to <log_file>, and fails (no output, rc 1) for any file whose name
+# contains "broken" - the way identify(1) reports one bad file in a batch
+# while still printing the others.
+# -----------------------------------------------------------------------------
+make_logging_identify() {
+    mkdir -p "${MOCK_BIN}"
+    printf '#!/bin/sh\nLOG="%s"\n' "$1" > "${MOCK_BIN}/identify"
+    cat >> "${MOCK_BIN}/identify" <<'EOF'
+FMT=""
+RC=0
+N=0
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -format) FMT=1; shift 2; continue ;;
+        -*) shift; continue ;;
+    esac
+    FILE="$1"; shift
+    N=$((N + 1))
+    case "$FILE" in *broken*) RC=1; continue ;; esac
+    [ -f "$FILE" ] || { RC=1; continue; }
+    if [ -n "$FMT" ]; then printf '%s\tJPEG\t100x100\n' "$FILE"
+    else echo "$FILE JPEG 100x100"; fi
+done
+echo "$N" >> "$LOG"
+exit $RC
+EOF
+    chmod +x "${MOCK_BIN}/identify"
+}
+
+test_h_batched_identify() {
+    test_header "Category H: Batched identify"
+
+    setup_all_mocks
+    local log="${TEST_DIR}/identify.log"
+    rm -f "${log}"
+    make_logging_identify "${log}"
+    rm -rf "${TEST_DIR}/in"
+    mkdir -p "${TEST_DIR}/in"
+    make_valid_jpeg "${TEST_DIR}/in/a.jpg"
+    make_valid_jpeg "${TEST_DIR}/in/b.jpg"
+    make_valid_jpeg "${TEST_DIR}/in/broken.jpg"
+    make_valid_jpeg "${TEST_DIR}/in/$(printf 'tab\tname.jpg')"
+    make_valid_jpeg "${TEST_DIR}/in/$(printf 'new\nline.jpg')"
+
+    local out="${TEST_DIR}/h.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-008" "${TEST_DIR}/in" "${out}" >/dev/null
+
+    # H1: every readable file keeps its identify result, including the
+    # ones sharing a batch with the failing file and the odd names.
+    local identified
+    identified=$(json_value "${out}" "
+len([f for n in d['results']['nodes']
+     if n.get('type') == 'integrityValidation'
+     for f in n['properties']['fileResults']
+     if f['status'] == 'valid' and f['imageFormat'] == 'JPEG' and f['dimensions'] == '100x100'])")
+    assert_equal "H1: a, b, tab and newline names valid with JPEG 100x100" "4" "${identified}"
+
+    # H2: the file identify rejects is not valid.
+    local broken
+    broken=$(file_verdict "${out}" broken.jpg)
+    case "${broken}" in
+        valid/*|"") fail "H2: identify failure -> not valid" "got: '${broken}'" ;;
+        *) pass "H2: identify failure -> ${broken}" ;;
+    esac
+
+    # H3: one batch call for the three plain names; single-file calls only
+    # for the failed file and the two names the batch format cannot carry.
+    assert_equal "H3: identify calls = 1 batch of 3 + 3 single" \
+        "1 1 1 3" "$(sort "${log}" | tr '\n' ' ' | sed 's/ $//')"
+}
+
 main() {
     check_prerequisites "3.10" "${TOOL_PATH}"
     rm -rf "${TEST_DIR}"
@@ -431,6 +790,9 @@ main() {
     test_c_boundaries
     test_d_json_structure
     test_e_exit_codes
+    test_f_inprocess_validators
+    test_g_verdict_cache
+    test_h_batched_identify
     print_summary "ptintegrityvalidation"
 }
 
@@ -8,7 +8,9 @@
 # Verifies the non-modification invariant: source files must be unchanged
 # after repair.
 #
-# Coverage: 5 categories per chapter 5.4.2 of the thesis.
+# Coverage: 5 categories per chapter 5.4.2 of the thesis, plus F for the
+# ptrepairdecision -> ptphotorepair report round trip and G for parallel
+# repair of same-named sources.
 #
 # Author:  Bc. Dominik Sabota, VUT FEKT Brno, 2026
 # License: GPL-3.0
@@ -19,6 +21,7 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 TOOLS_DIR="$(cd "${SCRIPT_DIR}/../ptforensicanalysis" && pwd)"
 TEST_DIR="${SCRIPT_DIR}/test_data_photorepair"
 TOOL_PATH="${SCRIPT_DIR}/../ptforensicanalysis/ptphotorepair.py"
+DECISION_TOOL_PATH="${SCRIPT_DIR}/../ptforensicanalysis/ptrepairdecision.py"
 
 source "${SCRIPT_DIR}/testlib/reference_values.sh"
 source "${SCRIPT_DIR}/testlib/test_framework.sh"
@@ -104,7 +107,7 @@ PYEOF
 }
 
 # -----------------------------------------------------------------------------
-# run_tool <case_id> <decisions_path> <json_out_path>
+# run_tool <case_id> <decisions_path> <json_out_path> [extra args...]
 #
 # Repaired files land in ${TEST_DIR}/out/<case_id>_repaired/<filename>.
 # -----------------------------------------------------------------------------
@@ -112,11 +115,13 @@ run_tool() {
     local case_id="$1"
     local decisions="$2"
     local out="$3"
+    shift 3
     local code=0
     invoke_tool "${TOOL_PATH}" "${case_id}" "${decisions}" \
         --output-dir "${TEST_DIR}/out" \
         --analyst "Test" \
         --json-out "${out}" \
+        "$@" \
         >/dev/null 2>&1 || code=$?
     echo "${code}"
 }
@@ -368,6 +373,130 @@ test_e_exit_codes() {
     esac
 }
 
+# =============================================================================
+# F: Decision report round trip (ptrepairdecision -> ptphotorepair)
+# =============================================================================
+
+# -----------------------------------------------------------------------------
+# run_decision_tool <n_repairable> <json_out_path> [extra args...]
+#
+# Runs ptrepairdecision over an integrity report with <n_repairable>
+# missing_footer records (paths need not exist; photorepair skips them).
+# -----------------------------------------------------------------------------
+run_decision_tool() {
+    local count="$1"
+    local out="$2"
+    shift 2
+    local integrity="${TEST_DIR}/integrity_${count}.json"
+    python3 - <<PYEOF
+import json
+records = [{"filename": f"f{i:04d}.jpg", "status": "repairable",
+            "corruptionType": "missing_footer", "path": "${TEST_DIR}/in/f{i:04d}.jpg"}
+           for i in range(${count})]
+doc = {"results": {"properties": {"caseId": "${PREFIX_PHOTO}-2026-01-01-001"},
+       "nodes": [{"type": "integrityValidation",
+                  "properties": {"fileResults": records}}]}}
+open("${integrity}", "w").write(json.dumps(doc))
+PYEOF
+    invoke_tool "${DECISION_TOOL_PATH}" "${PREFIX_PHOTO}-2026-01-01-001" "${integrity}" \
+        --output-dir "${TEST_DIR}/out" --analyst "Test" --json-out "${out}" "$@" \
+        >/dev/null 2>&1
+}
+
+test_f_decision_round_trip() {
+    test_header "Category F: Decision report round trip"
+    mkdir -p "${TEST_DIR}/in"
+
+    # F1: small plain run, then a large --gzip run under the same name.
+    # Photorepair, given the plain name, must load the 1000 new
+    # decisions, not the 3 from the earlier run.
+    local dec="${TEST_DIR}/f_repair_decisions.json"
+    run_decision_tool 3 "${dec}"
+    run_decision_tool 1000 "${dec}" --gzip
+    local out="${TEST_DIR}/f1.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" "${dec}" "${out}" >/dev/null
+    assert_equal "F1: large gzipped report read back (totalDecisions=1000)" \
+        "1000" "$(node_property "${out}" decisionsLoad totalDecisions)"
+
+    # F2: the compressed path itself is read directly.
+    out="${TEST_DIR}/f2.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" "${dec}.gz" "${out}" >/dev/null
+    assert_equal "F2: <file>.gz given explicitly (totalDecisions=1000)" \
+        "1000" "$(node_property "${out}" decisionsLoad totalDecisions)"
+
+    # F3/F4: when both <file> and <file>.gz exist, the newer one wins
+    # whichever it is.
+    run_decision_tool 3 "${TEST_DIR}/f_plain.json"
+    cp "${TEST_DIR}/f_plain.json" "${dec}"
+    touch -d "1 hour ago" "${dec}"
+    out="${TEST_DIR}/f3.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" "${dec}" "${out}" >/dev/null
+    assert_equal "F3: newer <file>.gz beats older plain file" \
+        "1000" "$(node_property "${out}" decisionsLoad totalDecisions)"
+
+    touch -d "2 hours ago" "${dec}.gz"
+    out="${TEST_DIR}/f4.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" "${dec}" "${out}" >/dev/null
+    assert_equal "F4: newer plain file beats older <file>.gz" \
+        "3" "$(node_property "${out}" decisionsLoad totalDecisions)"
+}
+
+# =============================================================================
+# G: Parallel repair with colliding basenames
+# =============================================================================
+
+# -----------------------------------------------------------------------------
+# distinct_count <dir>
+# Number of distinct file contents in <dir>, ignoring a trailing EOI so
+# repaired copies compare equal to their sources.
+# -----------------------------------------------------------------------------
+distinct_count() {
+    python3 -c "
+import pathlib
+print(len({p.read_bytes().removesuffix(b'\\xff\\xd9') for p in pathlib.Path('$1').iterdir()}))
+" 2>/dev/null
+}
+
+test_g_parallel_collisions() {
+    test_header "Category G: Parallel repair with colliding basenames"
+
+    # 12 sources named dup.jpg (repairable: SOI, no EOI) and 12 named
+    # bad.jpg (unrepairable: no SOI), all the same size, in separate
+    # directories. With -w 4 every copy must land under its own name in
+    # _repaired/ and _repair_failed/ respectively.
+    local case_id="${PREFIX_PHOTO}-2026-01-01-007"
+    python3 - <<PYEOF
+import json, pathlib
+base = pathlib.Path("${TEST_DIR}/g_in")
+decisions = []
+for i in range(12):
+    d = base / f"s{i:02d}"
+    d.mkdir(parents=True, exist_ok=True)
+    good, bad = d / "dup.jpg", d / "bad.jpg"
+    good.write_bytes(b"\xff\xd8" + bytes([i + 1]) * 200)
+    bad.write_bytes(b"\x00\x00" + bytes([i + 1]) * 200)
+    decisions.append({"filename": "dup.jpg", "path": str(good), "decision": "ATTEMPT_REPAIR",
+                      "corruptionType": "missing_footer", "format": "jpeg"})
+    decisions.append({"filename": "bad.jpg", "path": str(bad), "decision": "ATTEMPT_REPAIR",
+                      "corruptionType": "missing_footer", "format": "jpeg"})
+doc = {"results": {"properties": {"caseId": "${case_id}"},
+       "nodes": [{"type": "repairDecision", "properties": {"decisions": decisions}}]}}
+open("${TEST_DIR}/g_dec.json", "w").write(json.dumps(doc))
+PYEOF
+    local out="${TEST_DIR}/g.json"
+    run_tool "${case_id}" "${TEST_DIR}/g_dec.json" "${out}" -w 4 >/dev/null
+
+    assert_json_field "G1: all 12 dup.jpg repaired" "${out}" \
+        "d['results']['properties'].get('repaired')" "12"
+    assert_equal "G2: 12 distinct repaired copies" \
+        "12" "$(distinct_count "${TEST_DIR}/out/${case_id}_repaired")"
+    assert_equal "G3: 12 distinct failed-evidence copies" \
+        "12" "$(distinct_count "${TEST_DIR}/out/${case_id}_repair_failed")"
+    assert_json_field "G4: repairedPath unique per result" "${out}" "
+len({r['repairedPath'] for n in d['results']['nodes'] if n.get('type') == 'repairResults'
+     for r in n['properties']['repairResults'] if r.get('success')})" "12"
+}
+
 main() {
     check_prerequisites "3.10" "${TOOL_PATH}"
     rm -rf "${TEST_DIR}"
@@ -378,6 +507,8 @@ main() {
     test_c_boundaries
     test_d_json_structure
     test_e_exit_codes
+    test_f_decision_round_trip
+    test_g_parallel_collisions
     print_summary "ptphotorepair"
 }
 
@@ -8,7 +8,8 @@
 # This module does not modify files; it consumes a JSON integrity
 # report and produces a JSON decision report.
 #
-# Coverage: 5 categories per chapter 5.4.2 of the thesis.
+# Coverage: 5 categories per chapter 5.4.2 of the thesis, plus F for the
+# gzip report write/read round trip.
 #
 # Rule mapping (driven by REPAIR_SUCCESS_RATES, thesis Annex B):
 #     R1  rate >= 85       -> ATTEMPT_REPAIR
@@ -113,15 +114,71 @@ sum(1 for n in d['results']['nodes']
 }
 
 
+# -----------------------------------------------------------------------------
+# write_bulk_integrity_report <out_path> <n_repairable> [gzip]
+#
+# Writes an integrity report with <n_repairable> missing_footer records
+# and the summary counters ptintegrityvalidation emits ahead of
+# fileResults. A third argument "gzip" compresses the file.
+# -----------------------------------------------------------------------------
+write_bulk_integrity_report() {
+    local out_path="$1"
+    local count="$2"
+    local compress="${3:-}"
+    python3 - <<PYEOF
+import gzip, json
+records = [{"filename": f"f{i:04d}.jpg", "status": "repairable",
+            "corruptionType": "missing_footer", "path": f"/tmp/f{i:04d}.jpg"}
+           for i in range(${count})]
+doc = {
+    "results": {
+        "properties": {"caseId": "${PREFIX_PHOTO}-2026-01-01-001", "totalFiles": ${count}},
+        "nodes": [{
+            "type": "integrityValidation",
+            "properties": {"totalFiles": ${count}, "repairableFiles": ${count},
+                           "fileResults": records},
+        }],
+    },
+}
+raw = json.dumps(doc).encode()
+open("${out_path}", "wb").write(gzip.compress(raw) if "${compress}" == "gzip" else raw)
+PYEOF
+}
+
+
+# -----------------------------------------------------------------------------
+# gz_json_value <gz_file> <python_expr>
+#
+# json_value for a gzip-compressed report; '' if the file is not gzip.
+# -----------------------------------------------------------------------------
+gz_json_value() {
+    local file="$1"
+    local expr="$2"
+    python3 -c "
+import gzip, json
+try:
+    d = json.loads(gzip.open('${file}').read())
+    print(${expr})
+except Exception:
+    print('')
+" 2>/dev/null
+}
+
+
+# -----------------------------------------------------------------------------
+# run_tool <case_id> <integrity_path> <json_out_path> [extra args...]
+# -----------------------------------------------------------------------------
 run_tool() {
     local case_id="$1"
     local integrity="$2"
     local out="$3"
+    shift 3
     local code=0
     invoke_tool "${TOOL_PATH}" "${case_id}" "${integrity}" \
         --output-dir "${TEST_DIR}/out" \
         --analyst "Test" \
         --json-out "${out}" \
+        "$@" \
         >/dev/null 2>&1 || code=$?
     echo "${code}"
 }
@@ -381,6 +438,107 @@ test_e_exit_codes() {
 }
 
 
+# =============================================================================
+# F: Report compression round trip
+# =============================================================================
+test_f_gzip_round_trip() {
+    test_header "Category F: Report compression round trip"
+
+    # F1: without --gzip a large report is written plain to exactly the
+    # --json-out path; no .gz sibling appears.
+    write_bulk_integrity_report "${TEST_DIR}/f_in.json" 1000
+    local out="${TEST_DIR}/f1.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" \
+        "${TEST_DIR}/f_in.json" "${out}" >/dev/null
+    local total
+    total=$(json_value "${out}" \
+        "d['results']['properties'].get('totalRepairable', -1)")
+    if [ "${total}" = "1000" ] && [ ! -e "${out}.gz" ]; then
+        pass "F1: 1000-decision report written plain to --json-out"
+    else
+        fail "F1: plain report at --json-out" \
+             "totalRepairable=${total}, .gz exists: $([ -e "${out}.gz" ] && echo yes || echo no)"
+    fi
+
+    # F2: --gzip writes <json-out>.gz next to the plain report from F1
+    # and leaves that report alone.
+    local code
+    code=$(run_tool "${PREFIX_PHOTO}-2026-01-01-001" \
+        "${TEST_DIR}/f_in.json" "${out}" --gzip)
+    assert_exit_code "F2: --gzip run -> exit 0" "${EXIT_SUCCESS}" "${code}"
+    total=$(gz_json_value "${out}.gz" \
+        "d['results']['properties'].get('totalRepairable', -1)")
+    assert_equal "F2: <json-out>.gz decompresses to 1000 decisions" "1000" "${total}"
+    if [ -f "${out}" ]; then
+        pass "F2: plain report of the same name left in place"
+    else
+        fail "F2: plain report of the same name left in place" "${out} was removed"
+    fi
+
+    # F3: a --json-out ending in .gz is gzipped even without --gzip, and
+    # an unrelated file named like its stem survives.
+    echo "unrelated evidence" > "${TEST_DIR}/f3"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" \
+        "${TEST_DIR}/f_in.json" "${TEST_DIR}/f3.gz" >/dev/null
+    total=$(gz_json_value "${TEST_DIR}/f3.gz" \
+        "d['results']['properties'].get('totalRepairable', -1)")
+    assert_equal "F3: -j X.gz without --gzip -> gzipped report" "1000" "${total}"
+    assert_equal "F3: unrelated X survives -j X.gz" \
+        "unrelated evidence" "$(cat "${TEST_DIR}/f3" 2>/dev/null)"
+
+    # F4: a gzipped integrity report is read back transparently.
+    write_bulk_integrity_report "${TEST_DIR}/f4_in.json.gz" 40 gzip
+    out="${TEST_DIR}/f4.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" \
+        "${TEST_DIR}/f4_in.json.gz" "${out}" >/dev/null
+    total=$(json_value "${out}" \
+        "d['results']['properties'].get('totalRepairable', -1)")
+    assert_equal "F4: gzipped integrity report -> 40 decisions" "40" "${total}"
+
+    # F5: the summary preflight trusts repairableFiles=0 and skips
+    # fileResults (here deliberately inconsistent to prove it).
+    python3 - <<PYEOF
+import json
+doc = {"results": {"properties": {"caseId": "${PREFIX_PHOTO}-2026-01-01-001"},
+       "nodes": [{"type": "integrityValidation",
+                  "properties": {"totalFiles": 7, "repairableFiles": 0,
+                                 "fileResults": [{"filename": "x.jpg", "status": "repairable",
+                                                  "corruptionType": "missing_footer",
+                                                  "path": "/tmp/x.jpg"}]}}]}}
+open("${TEST_DIR}/f5_in.json", "w").write(json.dumps(doc))
+PYEOF
+    out="${TEST_DIR}/f5.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" \
+        "${TEST_DIR}/f5_in.json" "${out}" >/dev/null
+    total=$(json_value "${out}" \
+        "d['results']['properties'].get('totalRepairable', -1)")
+    assert_equal "F5: repairableFiles=0 summary -> no decisions" "0" "${total}"
+
+    # F6: merged report - an earlier node's repairableFiles=0 must not
+    # trigger the preflight; only the integrityValidation node counts.
+    python3 - <<PYEOF
+import json
+doc = {"results": {"properties": {"caseId": "${PREFIX_PHOTO}-2026-01-01-001"},
+       "nodes": [{"type": "consolidationSummary",
+                  "properties": {"totalFiles": 9, "repairableFiles": 0}},
+                 {"type": "integrityValidation",
+                  "properties": {"totalFiles": 2, "repairableFiles": 1,
+                                 "fileResults": [{"filename": "x.jpg", "status": "repairable",
+                                                  "corruptionType": "missing_footer",
+                                                  "path": "/tmp/x.jpg"},
+                                                 {"filename": "y.jpg", "status": "valid",
+                                                  "corruptionType": "", "path": "/tmp/y.jpg"}]}}]}}
+open("${TEST_DIR}/f6_in.json", "w").write(json.dumps(doc))
+PYEOF
+    out="${TEST_DIR}/f6.json"
+    run_tool "${PREFIX_PHOTO}-2026-01-01-001" \
+        "${TEST_DIR}/f6_in.json" "${out}" >/dev/null
+    total=$(json_value "${out}" \
+        "d['results']['properties'].get('totalRepairable', -1)")
+    assert_equal "F6: other node's repairableFiles=0 ignored -> 1 decision" "1" "${total}"
+}
+
+
 main() {
     check_prerequisites "3.10" "${TOOL_PATH}"
     rm -rf "${TEST_DIR}"
@@ -391,6 +549,7 @@ main() {
     test_c_boundaries
     test_d_json_structure
     test_e_exit_codes
+    test_f_gzip_round_trip
     print_summary "ptrepairdecision"
 }
 